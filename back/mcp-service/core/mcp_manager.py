@@ -84,6 +84,8 @@ class MCPServerProcess:
                     "name": tool_name,
                     "description": tool_def.get("description", ""),
                     "parameters": tool_def.get("parameters", {}),
+                    # Lets clients share results of identical concurrent calls
+                    "read_only": tool_def.get("read_only", False),
                     "server": self.name,
                 }
                 for tool_name, tool_def in tool_definitions.items()
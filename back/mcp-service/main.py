@@ -5,12 +5,15 @@ This service provides standardized tool interfaces through MCP protocol,
 allowing other services to connect and use tools like calculator and web scraper.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from config import get_config
 from core.mcp_manager import MCPManager
@@ -94,9 +97,20 @@ async def list_servers():
     return await mcp_manager.get_server_info()
 
 
+def _tools_etag(tools: Any) -> str:
+    """Strong ETag for a tool list, so clients can revalidate cheaply."""
+    digest = hashlib.blake2b(
+        json.dumps(tools, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
 @app.get("/servers/{server_name}/tools")
-async def list_server_tools(server_name: str):
-    """List tools available from a specific server."""
+async def list_server_tools(server_name: str, request: Request, response: Response):
+    """List tools available from a specific server.
+
+    Answers 304 when If-None-Match carries the current ETag.
+    """
     global mcp_manager
 
     if not mcp_manager:
@@ -104,10 +118,16 @@ async def list_server_tools(server_name: str):
 
     try:
         tools = await mcp_manager.list_server_tools(server_name)
-        return {"server": server_name, "tools": tools}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+    etag = _tools_etag(tools)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return {"server": server_name, "tools": tools}
+
 
 @app.post("/servers/{server_name}/tools/{tool_name}")
 async def call_tool(server_name: str, tool_name: str, arguments: Dict[str, Any] = None):
@@ -129,6 +149,37 @@ async def call_tool(server_name: str, tool_name: str, arguments: Dict[str, Any]
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/servers/{server_name}/tools/{tool_name}/batch")
+async def call_tool_batch(
+    server_name: str, tool_name: str, arguments_list: List[Dict[str, Any]]
+):
+    """Call a tool once per argument set, concurrently.
+
+    Each entry of the response is {"result": ...} or {"error": ...}, in the
+    order of the request.
+    """
+    global mcp_manager
+
+    if not mcp_manager:
+        raise HTTPException(status_code=503, detail="MCP manager not available")
+
+    results = await asyncio.gather(
+        *(
+            mcp_manager.call_tool(server_name, tool_name, arguments or {})
+            for arguments in arguments_list
+        ),
+        return_exceptions=True,
+    )
+    return {
+        "results": [
+            {"error": str(result)}
+            if isinstance(result, Exception)
+            else {"result": result}
+            for result in results
+        ]
+    }
+
+
 @app.post("/servers/restart")
 async def restart_servers():
     """Restart all MCP servers."""
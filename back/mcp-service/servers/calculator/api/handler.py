@@ -22,6 +22,7 @@ class CalculatorAPIHandler(BaseAPIHandler):
         return {
             "calculate": {
                 "description": "Perform mathematical calculations including basic arithmetic, advanced functions, and expressions",
+                "read_only": True,
                 "parameters": {
                     "type": "object",
                     "properties": {
@@ -40,6 +41,7 @@ class CalculatorAPIHandler(BaseAPIHandler):
             },
             "calculate_statistics": {
                 "description": "Calculate statistical measures (mean, median, mode, standard deviation) for a dataset",
+                "read_only": True,
                 "parameters": {
                     "type": "object",
                     "properties": {
@@ -60,6 +62,7 @@ class CalculatorAPIHandler(BaseAPIHandler):
             },
             "convert_units": {
                 "description": "Convert between different units of measurement",
+                "read_only": True,
                 "parameters": {
                     "type": "object",
                     "properties": {
@@ -77,6 +80,7 @@ class CalculatorAPIHandler(BaseAPIHandler):
             },
             "list_math_functions": {
                 "description": "Get a list of available mathematical functions and their descriptions",
+                "read_only": True,
                 "parameters": {"type": "object", "properties": {}},
             },
         }
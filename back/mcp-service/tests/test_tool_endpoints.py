@@ -0,0 +1,76 @@
+"""
+Tests for the tool listing and batch call endpoints.
+"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+
+TOOLS = [{"name": "add", "description": "Add numbers", "parameters": {}}]
+
+
+class FakeManager:
+    """Stands in for MCPManager with one server named calc."""
+
+    async def list_server_tools(self, server_name):
+        if server_name != "calc":
+            raise ValueError(f"Server '{server_name}' not found")
+        return TOOLS
+
+    async def call_tool(self, server_name, tool_name, arguments):
+        if "fail" in arguments:
+            raise RuntimeError("boom")
+        return arguments["a"] + arguments["b"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "mcp_manager", FakeManager())
+    # Without a with block the lifespan (real servers) does not run
+    return TestClient(main.app)
+
+
+def test_tool_list_carries_etag(client):
+    response = client.get("/servers/calc/tools")
+
+    assert response.status_code == 200
+    assert response.json() == {"server": "calc", "tools": TOOLS}
+    assert response.headers["etag"] == main._tools_etag(TOOLS)
+
+
+def test_matching_etag_answers_304(client):
+    etag = client.get("/servers/calc/tools").headers["etag"]
+
+    response = client.get("/servers/calc/tools", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_stale_etag_answers_full_list(client):
+    response = client.get("/servers/calc/tools", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.json()["tools"] == TOOLS
+
+
+def test_unknown_server_is_404(client):
+    assert client.get("/servers/nope/tools").status_code == 404
+
+
+def test_batch_returns_results_in_order_with_errors_inline(client):
+    response = client.post(
+        "/servers/calc/tools/add/batch",
+        json=[{"a": 1, "b": 2}, {"fail": True}, {"a": 3, "b": 4}],
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [{"result": 3}, {"error": "boom"}, {"result": 7}]
+    }
@@ -14,7 +14,9 @@ async def get_zookeeper_client() -> ZookeeperClient:
     global _zk_client
     if _zk_client is None:
         _zk_client = ZookeeperClient(
-            hosts=settings.zookeeper_hosts, timeout=settings.zookeeper_timeout
+            hosts=settings.zookeeper_hosts,
+            timeout=settings.zookeeper_timeout,
+            codec=settings.znode_codec,
         )
     return _zk_client
 
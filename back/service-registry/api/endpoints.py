@@ -1,6 +1,10 @@
 """API endpoints for the service registry."""
 
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 
 from models import (
     ServiceInfo,
@@ -11,24 +15,31 @@ from models import (
     RegistryStats,
     ServiceStatus,
 )
-from core.service_registry import ServiceRegistry
+from core.service_registry import ServiceRegistry, heartbeat_token
+from config import settings
 from .dependencies import get_service_registry
+from .negotiation import MsgPackRoute, negotiated_response
 
-router = APIRouter()
+router = APIRouter(route_class=MsgPackRoute)
 
 
 @router.post("/register", response_model=dict)
 async def register_service(
+    request: Request,
     registration: ServiceRegistration,
     registry: ServiceRegistry = Depends(get_service_registry),
-) -> dict:
+) -> Response:
     """Register a new service with the registry."""
     try:
         service_id = await registry.register_service(registration)
-        return {
-            "service_id": service_id,
-            "message": f"Service '{registration.name}' registered successfully",
-        }
+        return negotiated_response(
+            request,
+            {
+                "service_id": service_id,
+                "heartbeat_token": heartbeat_token(service_id),
+                "message": f"Service '{registration.name}' registered successfully",
+            },
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
@@ -61,47 +72,53 @@ async def update_service(
 
 @router.get("/services/{service_id}", response_model=ServiceInfo)
 async def get_service(
-    service_id: str, registry: ServiceRegistry = Depends(get_service_registry)
-) -> ServiceInfo:
+    request: Request,
+    service_id: str,
+    registry: ServiceRegistry = Depends(get_service_registry),
+) -> Response:
     """Get service information by ID."""
     service = await registry.get_service(service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    return service
+    return negotiated_response(request, service)
 
 
 @router.get("/services/name/{service_name}", response_model=ServiceInfo)
 async def get_service_by_name(
-    service_name: str, registry: ServiceRegistry = Depends(get_service_registry)
-) -> ServiceInfo:
+    request: Request,
+    service_name: str,
+    registry: ServiceRegistry = Depends(get_service_registry),
+) -> Response:
     """Get service information by name."""
     service = await registry.get_service_by_name(service_name)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    return service
+    return negotiated_response(request, service)
 
 
 @router.post("/discover", response_model=ServiceDiscoveryResponse)
 async def discover_services(
+    request: Request,
     query: ServiceDiscoveryQuery,
     registry: ServiceRegistry = Depends(get_service_registry),
-) -> ServiceDiscoveryResponse:
+) -> Response:
     """Discover services based on query criteria."""
-    return await registry.discover_services(query)
+    return negotiated_response(request, await registry.discover_services(query))
 
 
 @router.get("/discover", response_model=ServiceDiscoveryResponse)
 async def discover_services_get(
+    request: Request,
     service_type: str = None,
     name: str = None,
     status: str = None,
     registry: ServiceRegistry = Depends(get_service_registry),
-) -> ServiceDiscoveryResponse:
+) -> Response:
     """Discover services using GET parameters."""
     query = ServiceDiscoveryQuery(service_type=service_type, name=name, status=status)
-    return await registry.discover_services(query)
+    return negotiated_response(request, await registry.discover_services(query))
 
 
 @router.post("/heartbeat/{service_id}")
@@ -116,6 +133,30 @@ async def heartbeat(
     return {"message": "Heartbeat recorded"}
 
 
+@router.get("/events")
+async def stream_events(
+    request: Request, registry: ServiceRegistry = Depends(get_service_registry)
+) -> StreamingResponse:
+    """Stream service change events as Server-Sent Events."""
+    queue = registry.subscribe_events()
+
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.event_keepalive_interval
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+        finally:
+            registry.unsubscribe_events(queue)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/stats", response_model=RegistryStats)
 async def get_registry_stats(
     registry: ServiceRegistry = Depends(get_service_registry),
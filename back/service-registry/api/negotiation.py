@@ -0,0 +1,74 @@
+"""JSON / MessagePack content negotiation for registry endpoints."""
+
+from typing import Any, Callable, Coroutine
+
+import orjson
+import ormsgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class _MsgPackRequest(Request):
+    """Request whose MessagePack body is exposed to FastAPI as JSON."""
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_transcoded"):
+            raw = await super().body()
+            self._body = orjson.dumps(ormsgpack.unpackb(raw)) if raw else raw
+            self._transcoded = True
+        return self._body
+
+
+class MsgPackRoute(APIRoute):
+    """Route class accepting application/msgpack request bodies.
+
+    MessagePack bodies are transcoded to JSON before FastAPI validates them,
+    so endpoints keep declaring plain pydantic body parameters.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type", "")
+            if content_type.startswith(MSGPACK_MEDIA_TYPE):
+                scope = dict(request.scope)
+                scope["headers"] = [
+                    (key, value)
+                    for key, value in request.scope["headers"]
+                    if key != b"content-type"
+                ] + [(b"content-type", b"application/json")]
+                request = _MsgPackRequest(scope, request.receive)
+            return await original_handler(request)
+
+        return route_handler
+
+
+def negotiated_response(request: Request, content: Any) -> Response:
+    """Encode a response as MessagePack or JSON based on the Accept header.
+
+    Args:
+        request: Incoming request
+        content: Pydantic model or JSON-compatible data
+
+    Returns:
+        Encoded response
+    """
+    wants_msgpack = MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+
+    if isinstance(content, BaseModel):
+        if not wants_msgpack:
+            # Serialize straight to JSON bytes in pydantic-core, skipping the
+            # intermediate dict
+            return Response(
+                content.__pydantic_serializer__.to_json(content),
+                media_type="application/json",
+            )
+        content = content.model_dump(mode="json")
+
+    if wants_msgpack:
+        return Response(ormsgpack.packb(content), media_type=MSGPACK_MEDIA_TYPE)
+    return Response(orjson.dumps(content), media_type="application/json")
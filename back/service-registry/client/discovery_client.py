@@ -1,10 +1,15 @@
 """Service discovery client for microservices."""
 
 import asyncio
+import logging
 import random
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Set, Tuple
+from datetime import timedelta
 import httpx
+import orjson
+import ormsgpack
 
 from ..models import (
     ServiceInfo,
@@ -16,6 +21,54 @@ from ..models import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+_MSGPACK_MEDIA_TYPE = "application/msgpack"
+_SERVICE_ID_HEADER = "X-Service-Id"
+_SERVICE_TOKEN_HEADER = "X-Service-Token"
+_HEARTBEAT_RECORDED_HEADER = "X-Heartbeat-Recorded"
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_MSGPACK_HEADERS = {
+    "Content-Type": _MSGPACK_MEDIA_TYPE,
+    "Accept": _MSGPACK_MEDIA_TYPE,
+}
+
+# (service_type, name, tags, capabilities, status)
+_CacheKey = Tuple[
+    Optional[ServiceType],
+    Optional[str],
+    Optional[Tuple[str, ...]],
+    Optional[Tuple[str, ...]],
+    ServiceStatus,
+]
+
+
+class _RateLimiter:
+    """Token bucket allowing at most `rate` events per second."""
+
+    def __init__(self, rate: float = 1.0):
+        self._rate = rate
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+
+    def allow(self) -> bool:
+        """Consume a token if one is available."""
+        now = time.monotonic()
+        self._tokens = min(1.0, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+def _decode_response(response: httpx.Response) -> Any:
+    """Decode a registry response body according to its content type."""
+    if response.headers.get("content-type", "").startswith(_MSGPACK_MEDIA_TYPE):
+        return ormsgpack.unpackb(response.content)
+    return orjson.loads(response.content)
+
+
 class ServiceDiscoveryClient:
     """Client for service discovery and registration."""
 
@@ -28,14 +81,51 @@ class ServiceDiscoveryClient:
         """
         self.registry_url = registry_url.rstrip("/")
         self.service_id = service_id
-        self._client = httpx.AsyncClient(timeout=30.0)
-        self._cache: Dict[str, Any] = {}
-        self._cache_ttl = timedelta(seconds=60)
+        self._client = httpx.AsyncClient(
+            timeout=30.0, event_hooks={"response": [self._on_response]}
+        )
+        # Monotonic time the registry last acknowledged a heartbeat from us
+        self._last_heartbeat_ack = 0.0
+        # Issued on registration; sent with registry requests only, never
+        # with calls to other services through the shared client
+        self._heartbeat_token: Optional[str] = None
+        # LRU of discovery results: query tuple -> (services, monotonic time)
+        self._cache: "OrderedDict[_CacheKey, Tuple[List[ServiceInfo], float]]" = (
+            OrderedDict()
+        )
+        self._cache_max_entries = 256
+        # Cache keys holding each service, so removals only evict those entries
+        self._cache_index: Dict[str, Set[_CacheKey]] = {}
+        # Entries are invalidated by registry events; the TTL is a safety net
+        self._cache_ttl = timedelta(minutes=10)
+        # Used instead while the event stream is down and events may be missed
+        self._fallback_cache_ttl = timedelta(seconds=60)
+        self._events_task: Optional[asyncio.Task] = None
+        self._events_connected = False
         self._heartbeat_task: Optional[asyncio.Task] = None
         self._heartbeat_interval = 30  # seconds
+        # Smoothed response time (seconds) per service base URL
+        self._rtt_ewma: Dict[str, float] = {}
+        # Cleared once the registry answers a MessagePack body with 415
+        self._use_msgpack = True
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet; the event stream starts on first discovery
+            pass
+        else:
+            self._start_events()
 
     async def close(self):
         """Close the client and cleanup resources."""
+        if self._events_task:
+            self._events_task.cancel()
+            try:
+                await self._events_task
+            except asyncio.CancelledError:
+                pass
+
         if self._heartbeat_task:
             self._heartbeat_task.cancel()
             try:
@@ -54,19 +144,69 @@ class ServiceDiscoveryClient:
         Returns:
             Service ID
         """
-        response = await self._client.post(
-            f"{self.registry_url}/api/v1/register", json=registration.model_dump()
+        result = await self._post_registry(
+            "/register", registration.model_dump(mode="json")
         )
-        response.raise_for_status()
-
-        result = response.json()
         self.service_id = result["service_id"]
+        # With a token, every registry request doubles as a heartbeat
+        self._heartbeat_token = result.get("heartbeat_token")
 
         # Start heartbeat task
         self._start_heartbeat()
 
         return self.service_id
 
+    def _registry_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """Add this service's identity to the headers of a registry request.
+
+        Args:
+            headers: Headers of the request
+
+        Returns:
+            The headers, extended with the service ID and heartbeat token
+        """
+        if not self.service_id:
+            return headers
+        headers = {**headers, _SERVICE_ID_HEADER: self.service_id}
+        if self._heartbeat_token:
+            headers[_SERVICE_TOKEN_HEADER] = self._heartbeat_token
+        return headers
+
+    async def _post_registry(self, path: str, payload: Dict[str, Any]) -> Any:
+        """POST to the registry, preferring MessagePack over JSON.
+
+        Args:
+            path: API path below /api/v1
+            payload: JSON-compatible request body
+
+        Returns:
+            Decoded response body
+        """
+        url = f"{self.registry_url}/api/v1{path}"
+
+        if self._use_msgpack:
+            response = await self._client.post(
+                url,
+                content=ormsgpack.packb(payload),
+                headers=self._registry_headers(_MSGPACK_HEADERS),
+            )
+            if response.status_code not in (415, 422):
+                response.raise_for_status()
+                return _decode_response(response)
+            # Only a 415 says the registry cannot read MessagePack. A 422 may
+            # be an older registry or just an invalid payload, so only this
+            # request is retried as JSON.
+            if response.status_code == 415:
+                self._use_msgpack = False
+
+        response = await self._client.post(
+            url,
+            content=orjson.dumps(payload),
+            headers=self._registry_headers(_JSON_HEADERS),
+        )
+        response.raise_for_status()
+        return _decode_response(response)
+
     async def unregister_service(self) -> bool:
         """Unregister this service from the registry."""
         if not self.service_id:
@@ -85,6 +225,7 @@ class ServiceDiscoveryClient:
                 f"{self.registry_url}/api/v1/unregister/{self.service_id}"
             )
             response.raise_for_status()
+            self._heartbeat_token = None
             return True
         except httpx.HTTPError:
             return False
@@ -112,13 +253,27 @@ class ServiceDiscoveryClient:
             List of matching services
         """
         # Create cache key
-        cache_key = f"discover_{service_type}_{name}_{tags}_{capabilities}_{status}"
+        cache_key = (
+            service_type,
+            name,
+            tuple(tags) if tags else None,
+            tuple(capabilities) if capabilities else None,
+            status,
+        )
 
         # Check cache
-        if use_cache and cache_key in self._cache:
-            cached_data, timestamp = self._cache[cache_key]
-            if datetime.now() - timestamp < self._cache_ttl:
-                return [ServiceInfo(**service) for service in cached_data]
+        if use_cache:
+            self._start_events()
+            if cache_key in self._cache:
+                cached_services, timestamp = self._cache[cache_key]
+                ttl = (
+                    self._cache_ttl
+                    if self._events_connected
+                    else self._fallback_cache_ttl
+                )
+                if time.monotonic() - timestamp < ttl.total_seconds():
+                    self._cache.move_to_end(cache_key)
+                    return list(cached_services)
 
         # Make discovery request
         query = ServiceDiscoveryQuery(
@@ -129,19 +284,23 @@ class ServiceDiscoveryClient:
             status=status,
         )
 
-        response = await self._client.post(
-            f"{self.registry_url}/api/v1/discover", json=query.model_dump()
+        result = ServiceDiscoveryResponse.model_validate(
+            await self._post_registry("/discover", query.model_dump(mode="json"))
         )
-        response.raise_for_status()
-
-        result = ServiceDiscoveryResponse(**response.json())
 
-        # Update cache
+        # Update cache; ServiceInfo objects are treated as immutable, so the
+        # parsed instances are shared with later callers
         if use_cache:
-            self._cache[cache_key] = (
-                [service.model_dump() for service in result.services],
-                datetime.now(),
-            )
+            self._cache.pop(cache_key, None)
+            if len(self._cache) >= self._cache_max_entries:
+                evicted_key, (evicted, _) = self._cache.popitem(last=False)
+                for service in evicted:
+                    keys = self._cache_index.get(service.service_id)
+                    if keys is not None:
+                        keys.discard(evicted_key)
+            self._cache[cache_key] = (list(result.services), time.monotonic())
+            for service in result.services:
+                self._cache_index.setdefault(service.service_id, set()).add(cache_key)
 
         return result.services
 
@@ -156,10 +315,11 @@ class ServiceDiscoveryClient:
         """
         try:
             response = await self._client.get(
-                f"{self.registry_url}/api/v1/services/name/{name}"
+                f"{self.registry_url}/api/v1/services/name/{name}",
+                headers=self._registry_headers({"Accept": _MSGPACK_MEDIA_TYPE}),
             )
             response.raise_for_status()
-            return ServiceInfo(**response.json())
+            return ServiceInfo.model_validate(_decode_response(response))
         except httpx.HTTPError:
             return None
 
@@ -174,7 +334,8 @@ class ServiceDiscoveryClient:
         Args:
             service_type: Filter by service type
             name: Filter by service name
-            load_balance: Whether to randomly select from multiple instances
+            load_balance: Whether to pick between instances using
+                power-of-two-choices on observed response time
 
         Returns:
             Service base URL or None
@@ -186,9 +347,11 @@ class ServiceDiscoveryClient:
         if not services:
             return None
 
-        # Select service instance
+        # Select service instance: of two random candidates, take the one
+        # with the lower smoothed response time (unmeasured counts as fastest)
         if load_balance and len(services) > 1:
-            service = random.choice(services)
+            candidates = random.sample(services, 2)
+            service = min(candidates, key=lambda s: self._rtt_ewma.get(s.base_url, 0.0))
         else:
             service = services[0]
 
@@ -226,13 +389,25 @@ class ServiceDiscoveryClient:
 
         url = f"{service_url}{endpoint}"
 
-        response = await self._client.request(
-            method=method, url=url, json=data, params=params, headers=headers
-        )
+        started = time.perf_counter()
+        try:
+            response = await self._client.request(
+                method=method, url=url, json=data, params=params, headers=headers
+            )
+        finally:
+            self._record_rtt(service_url, time.perf_counter() - started)
         response.raise_for_status()
 
         return response
 
+    def _record_rtt(self, service_url: str, observed: float):
+        """Fold an observed response time into the service's EWMA."""
+        previous = self._rtt_ewma.get(service_url)
+        if previous is None:
+            self._rtt_ewma[service_url] = observed
+        else:
+            self._rtt_ewma[service_url] = 0.2 * observed + 0.8 * previous
+
     async def heartbeat(self) -> bool:
         """Send heartbeat for this service."""
         if not self.service_id:
@@ -240,31 +415,116 @@ class ServiceDiscoveryClient:
 
         try:
             response = await self._client.post(
-                f"{self.registry_url}/api/v1/heartbeat/{self.service_id}"
+                f"{self.registry_url}/api/v1/heartbeat/{self.service_id}",
+                headers=self._registry_headers({}),
             )
             response.raise_for_status()
+            self._last_heartbeat_ack = time.monotonic()
             return True
         except httpx.HTTPError:
             return False
 
+    async def _on_response(self, response: httpx.Response):
+        """Note registry responses confirming a piggybacked heartbeat."""
+        if (
+            response.is_success
+            and _HEARTBEAT_RECORDED_HEADER in response.headers
+            and str(response.request.url).startswith(self.registry_url)
+        ):
+            self._last_heartbeat_ack = time.monotonic()
+
     def _start_heartbeat(self):
         """Start the heartbeat task."""
         if self.service_id and not self._heartbeat_task:
             self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
     async def _heartbeat_loop(self):
-        """Background heartbeat loop."""
+        """Background heartbeat loop.
+
+        Wakes every half interval, so the registry never goes longer than
+        one interval without a heartbeat.
+        """
+        log_limiter = _RateLimiter()
+        check_interval = self._heartbeat_interval / 2
+        delay = check_interval
+        retry_delay = 1
+        while True:
+            try:
+                await asyncio.sleep(delay)
+                # A recent registry response already acknowledged one
+                if (
+                    time.monotonic() - self._last_heartbeat_ack < check_interval
+                    or await self.heartbeat()
+                ):
+                    delay = check_interval
+                    retry_delay = 1
+                    continue
+                error = "registry unreachable or service unknown"
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                error = str(e)
+
+            # Log error but continue heartbeat, backing off exponentially
+            if log_limiter.allow():
+                logger.warning(f"Heartbeat failed: {error}")
+            delay = retry_delay
+            retry_delay = min(retry_delay * 2, check_interval)
+
+    def _start_events(self):
+        """Start the registry event stream task."""
+        if not self._events_task:
+            self._events_task = asyncio.create_task(self._events_loop())
+
+    async def _events_loop(self):
+        """Background loop invalidating the cache from registry events.
+
+        While the stream is down, cached results expire after the fallback
+        TTL instead, since changes may go unnoticed.
+        """
+        log_limiter = _RateLimiter()
+        retry_delay = 1
         while True:
             try:
-                await asyncio.sleep(self._heartbeat_interval)
-                await self.heartbeat()
+                async with self._client.stream(
+                    "GET",
+                    f"{self.registry_url}/api/v1/events",
+                    timeout=httpx.Timeout(30.0, read=None),
+                ) as response:
+                    response.raise_for_status()
+                    # Changes made while disconnected were never delivered
+                    self.clear_cache()
+                    self._events_connected = True
+                    retry_delay = 1
+
+                    async for line in response.aiter_lines():
+                        if line.startswith("data:"):
+                            self._handle_event(orjson.loads(line[5:]))
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                # Log error but continue heartbeat
-                print(f"Heartbeat error: {e}")
-                await asyncio.sleep(5)  # Brief pause before retry
+                if log_limiter.allow():
+                    logger.warning(
+                        f"Registry event stream failed, retrying in {retry_delay}s: {e}"
+                    )
+            finally:
+                self._events_connected = False
+
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 60)
+
+    def _handle_event(self, event: Dict[str, Any]):
+        """Apply a registry event to the discovery cache."""
+        service_id = event.get("service_id")
+        if event.get("change") == "removed" and service_id:
+            # A removed service can only affect entries that contain it
+            for cache_key in self._cache_index.pop(service_id, ()):
+                self._cache.pop(cache_key, None)
+        else:
+            # New or changed services may start matching any cached query
+            self.clear_cache()
 
     def clear_cache(self):
         """Clear the discovery cache."""
         self._cache.clear()
+        self._cache_index.clear()
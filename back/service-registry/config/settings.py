@@ -19,11 +19,23 @@ class Settings(BaseSettings):
     # Zookeeper settings
     zookeeper_hosts: str = os.getenv("ZOOKEEPER_HOSTS", "zookeeper:2181")
     zookeeper_timeout: int = int(os.getenv("ZOOKEEPER_TIMEOUT", 10))
+    # Znode payload format for writes ("msgpack" or "json"); reads accept both
+    znode_codec: str = os.getenv("ZNODE_CODEC", "msgpack")
 
     # Service registry settings
     services_root_path: str = "/services"
     health_check_interval: int = 30  # seconds
+    health_check_concurrency: int = 64  # simultaneous health probes
     service_ttl: int = 60  # seconds
+    parallel_parse_threshold: int = 500  # services before parsing in processes
+    snapshot_coalesce_window: float = 0.05  # seconds between snapshot writes
+    # Signs the tokens that let ordinary requests count as heartbeats; those
+    # piggybacked heartbeats are disabled while it is empty
+    heartbeat_token_secret: str = os.getenv("HEARTBEAT_TOKEN_SECRET", "")
+
+    # Service change event stream
+    event_queue_size: int = 256  # buffered events per subscriber
+    event_keepalive_interval: int = 15  # seconds
 
     # Logging
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
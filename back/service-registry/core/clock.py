@@ -0,0 +1,29 @@
+"""Cached wall clock for hot paths."""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+# Wall-clock time refreshed once per second by run_clock()
+_cached_utcnow: Optional[datetime] = None
+
+
+def utcnow() -> datetime:
+    """Get the current UTC time, at most one tick stale.
+
+    Falls back to datetime.utcnow() when the clock task is not running.
+    """
+    if _cached_utcnow is None:
+        return datetime.utcnow()
+    return _cached_utcnow
+
+
+async def run_clock(interval: float = 1.0) -> None:
+    """Refresh the cached wall clock until cancelled."""
+    global _cached_utcnow
+    try:
+        while True:
+            _cached_utcnow = datetime.utcnow()
+            await asyncio.sleep(interval)
+    finally:
+        _cached_utcnow = None
@@ -1,26 +1,117 @@
 """Service Registry implementation using Zookeeper."""
 
 import asyncio
-import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import hashlib
+import hmac
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import httpx
+import uuid_utils
 
-from .zookeeper_client import ZookeeperClient
+from . import clock
+from .zookeeper_client import ZookeeperClient, decode_payload
 from .logging import get_logger
 from models import (
     ServiceInfo,
+    ServiceMetadata,
     ServiceRegistration,
     ServiceUpdate,
     ServiceStatus,
+    ServiceType,
     ServiceDiscoveryQuery,
     ServiceDiscoveryResponse,
     RegistryStats,
+    naive_utc,
 )
 from config import settings
 
 logger = get_logger(__name__)
 
+# Aggregate znode under the services root holding service_id -> last heartbeat
+LIVENESS_NODE = "_liveness"
+
+# Packed znode under the services root holding every service's current data;
+# the per-service ephemeral znodes mark which services are alive and keep the
+# data they were registered with
+SNAPSHOT_NODE = "_snapshot"
+
+# Worker processes for validating large batches of znode payloads
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Get the shared payload parsing process pool."""
+    global _parse_pool
+    if _parse_pool is None:
+        # Spawn rather than fork: the parent runs kazoo threads
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_pool
+
+
+def _shutdown_parse_pool() -> None:
+    """Shut down the payload parsing process pool if it was started."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def _parse_service_infos(payloads: List[bytes]) -> List[Optional[ServiceInfo]]:
+    """Validate raw znode payloads into ServiceInfo objects.
+
+    Runs in worker processes for large batches, so it must stay module-level.
+    Invalid payloads yield None.
+    """
+    results: List[Optional[ServiceInfo]] = []
+    for raw in payloads:
+        try:
+            results.append(ServiceInfo.model_validate(decode_payload(raw)))
+        # ValidationError is a ValueError; TypeError covers malformed values
+        # reaching model_post_init
+        except (TypeError, ValueError):
+            results.append(None)
+    return results
+
+
+def heartbeat_token(service_id: str) -> Optional[str]:
+    """Derive the token a service sends to piggyback heartbeats.
+
+    Stateless, so every registry replica sharing the secret accepts it.
+
+    Args:
+        service_id: Service ID
+
+    Returns:
+        Hex token, or None when no secret is configured
+    """
+    if not settings.heartbeat_token_secret:
+        return None
+    return hmac.new(
+        settings.heartbeat_token_secret.encode("utf-8"),
+        service_id.encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def _index_discard(index: Dict[Any, Set[str]], key: Any, service_id: str) -> None:
+    """Remove a service ID from a secondary index, dropping emptied keys."""
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(service_id)
+        if not ids:
+            del index[key]
+
 
 class ServiceRegistry:
     """Service registry using Zookeeper for coordination."""
@@ -33,29 +124,70 @@ class ServiceRegistry:
         """
         self.zk_client = zk_client
         self.services: Dict[str, ServiceInfo] = {}
+        # Live key set of self.services, diffed against watcher snapshots.
+        # Mutated on the event loop and read on kazoo threads, so writes and
+        # off-loop reads hold the lock
+        self._service_id_set: Set[str] = set()
+        self._service_id_lock = threading.Lock()
+        # Secondary indexes of service IDs, kept in step with self.services
+        self._by_type: Dict[ServiceType, Set[str]] = defaultdict(set)
+        self._by_status: Dict[ServiceStatus, Set[str]] = defaultdict(set)
+        self._by_tag: Dict[str, Set[str]] = defaultdict(set)
+        # Heartbeats received since the last liveness flush
+        self._pending_heartbeats: Dict[str, datetime] = {}
+        # Interned "<root>/" prefix; child paths are built by concatenation
+        self._root = sys.intern(settings.services_root_path.rstrip("/") + "/")
+        self._liveness_path = self._root + LIVENESS_NODE
+        self._snapshot_path = self._root + SNAPSHOT_NODE
+        # Set when the snapshot is stale; writes are coalesced per window
+        self._snapshot_dirty = asyncio.Event()
+        self._snapshot_task: Optional[asyncio.Task] = None
+        # Services whose status change is waiting for the next flush
+        self._dirty_services: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
         self._health_check_task: Optional[asyncio.Task] = None
+        self._clock_task: Optional[asyncio.Task] = None
+        self._health_sema = asyncio.Semaphore(settings.health_check_concurrency)
+        # Monotonic time (ns) of each service's last status transition
+        self._status_changed_at: Dict[str, int] = {}
         self._running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event_subscribers: Set[asyncio.Queue] = set()
 
     async def start(self) -> None:
         """Start the service registry."""
         logger.info("Starting Service Registry...")
 
+        # Zookeeper watchers run on kazoo threads and hop back onto this loop
+        self._loop = asyncio.get_running_loop()
+
         # Connect to Zookeeper
         await self.zk_client.connect()
 
         # Ensure base paths exist
-        self.zk_client.ensure_path(settings.services_root_path)
+        await self.zk_client.ensure_path(settings.services_root_path)
+        await self.zk_client.ensure_path(self._liveness_path)
+        await self.zk_client.ensure_path(self._snapshot_path)
 
         # Load existing services from Zookeeper
         await self._load_services_from_zk()
+        self._apply_liveness(
+            await self.zk_client.get_node_data(self._liveness_path) or {}
+        )
 
-        # Start health check task
+        # Start clock, health check and pending write flush tasks
         self._running = True
+        self._clock_task = asyncio.create_task(clock.run_clock())
         self._health_check_task = asyncio.create_task(self._health_check_loop())
+        self._flush_task = asyncio.create_task(self._flush_pending_loop())
+        self._snapshot_task = asyncio.create_task(self._snapshot_writer_loop())
 
         # Watch for service changes
         self.zk_client.watch_children(
-            settings.services_root_path, self._on_services_changed
+            settings.services_root_path,
+            self._on_services_changed,
+            fetch_data=True,
+            fetch_filter=self._is_unknown_service_node,
         )
 
         logger.info("Service Registry started successfully")
@@ -66,13 +198,26 @@ class ServiceRegistry:
 
         self._running = False
 
-        # Cancel health check task
-        if self._health_check_task:
-            self._health_check_task.cancel()
-            try:
-                await self._health_check_task
-            except asyncio.CancelledError:
-                pass
+        # Cancel background tasks
+        for task in (
+            self._health_check_task,
+            self._flush_task,
+            self._snapshot_task,
+            self._clock_task,
+        ):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        # Persist heartbeats and updates received since the last flush
+        await self._flush_pending_writes()
+        if self._snapshot_dirty.is_set():
+            await self._write_snapshot()
+
+        _shutdown_parse_pool()
 
         # Disconnect from Zookeeper
         await self.zk_client.disconnect()
@@ -88,7 +233,8 @@ class ServiceRegistry:
         Returns:
             Service ID
         """
-        service_id = str(uuid.uuid4())
+        # UUIDv7 keeps service IDs ordered by registration time
+        service_id = str(uuid_utils.uuid7())
 
         # Create service info
         service_info = ServiceInfo(
@@ -103,13 +249,18 @@ class ServiceRegistry:
         )
 
         # Store in local cache
-        self.services[service_id] = service_info
+        self._add_service(service_info)
 
-        # Store in Zookeeper
-        zk_path = f"{settings.services_root_path}/{service_id}"
-        self.zk_client.create_node(zk_path, service_info.model_dump(), ephemeral=True)
+        # Store in Zookeeper: the ephemeral znode carries the registration so
+        # other replicas can pick it up, later changes go via the snapshot
+        zk_path = self._root + service_id
+        await self.zk_client.create_node(
+            zk_path, service_info.encode(self.zk_client.encode), ephemeral=True
+        )
+        self._snapshot_dirty.set()
 
         logger.info(f"Registered service: {registration.name} ({service_id})")
+        self._publish_event(service_id, "added")
 
         # Perform initial health check
         await self._check_service_health(service_info)
@@ -130,13 +281,14 @@ class ServiceRegistry:
             return False
 
         # Remove from local cache
-        service_info = self.services.pop(service_id)
+        service_info = self._remove_service(service_id)
 
         # Remove from Zookeeper
-        zk_path = f"{settings.services_root_path}/{service_id}"
-        self.zk_client.delete_node(zk_path)
+        zk_path = self._root + service_id
+        await self.zk_client.delete_node(zk_path)
 
         logger.info(f"Unregistered service: {service_info.name} ({service_id})")
+        self._publish_event(service_id, "removed")
         return True
 
     async def update_service(self, service_id: str, update: ServiceUpdate) -> bool:
@@ -155,21 +307,44 @@ class ServiceRegistry:
 
         service_info = self.services[service_id]
 
+        status_changed = (
+            update.status is not None and update.status != service_info.status
+        )
+        metadata_changed = (
+            update.metadata is not None and update.metadata != service_info.metadata
+        )
+        health_check_changed = (
+            update.health_check is not None
+            and update.health_check != service_info.health_check
+        )
+
+        # An update proves liveness just like a heartbeat
+        now = clock.utcnow()
+        service_info.mark_heartbeat(now, time.monotonic_ns())
+        self._pending_heartbeats[service_id] = now
+
+        # Clients often re-send their current state unchanged
+        if not (status_changed or metadata_changed or health_check_changed):
+            return True
+
         # Update fields
-        if update.status is not None:
-            service_info.status = update.status
-        if update.metadata is not None:
-            service_info.metadata = update.metadata
-        if update.health_check is not None:
+        if status_changed:
+            self._set_status(service_info, update.status)
+        if metadata_changed:
+            self._set_metadata(service_info, update.metadata)
+        if health_check_changed:
             service_info.health_check = update.health_check
 
-        service_info.last_heartbeat = datetime.utcnow()
-
-        # Update in Zookeeper
-        zk_path = f"{settings.services_root_path}/{service_id}"
-        self.zk_client.update_node_data(zk_path, service_info.model_dump())
+        if metadata_changed or health_check_changed:
+            # Written by the snapshot writer within one coalescing window
+            self._snapshot_dirty.set()
+            self._dirty_services.discard(service_id)
+        else:
+            # Status-only change: written by the next background flush
+            self._dirty_services.add(service_id)
 
         logger.debug(f"Updated service: {service_info.name} ({service_id})")
+        self._publish_event(service_id, "updated")
         return True
 
     async def discover_services(
@@ -183,48 +358,57 @@ class ServiceRegistry:
         Returns:
             List of matching services
         """
-        matching_services = []
-
-        for service_info in self.services.values():
-            if self._matches_query(service_info, query):
-                matching_services.append(service_info)
+        # Narrow down by the indexed filters first, smallest set first
+        indexed: List[Set[str]] = []
+        if query.service_type:
+            indexed.append(self._by_type.get(query.service_type, set()))
+        if query.status:
+            indexed.append(self._by_status.get(query.status, set()))
+        for tag in query.tags or ():
+            indexed.append(self._by_tag.get(tag, set()))
+
+        if indexed:
+            indexed.sort(key=len)
+            candidate_ids = indexed[0].intersection(*indexed[1:])
+            # Registration order; IDs alone can't give it, legacy ones are uuid4
+            candidates = sorted(
+                (self.services[sid] for sid in candidate_ids),
+                key=lambda s: (s.registered_at, s.service_id),
+            )
+        else:
+            candidates = self.services.values()
+
+        matches = self._build_query_predicate(query)
+        matching_services = [service for service in candidates if matches(service)]
 
         return ServiceDiscoveryResponse(
             services=matching_services, total_count=len(matching_services), query=query
         )
 
-    def _matches_query(
-        self, service: ServiceInfo, query: ServiceDiscoveryQuery
-    ) -> bool:
-        """Check if service matches discovery query."""
+    @staticmethod
+    def _build_query_predicate(
+        query: ServiceDiscoveryQuery,
+    ) -> Callable[[ServiceInfo], bool]:
+        """Build a predicate for the query filters not covered by indexes."""
+        checks: List[Callable[[ServiceInfo], bool]] = []
 
-        # Check service type
-        if query.service_type and service.service_type != query.service_type:
-            return False
+        # Service type, status and tags are served by the secondary indexes
 
         # Check name (partial match)
-        if query.name and query.name.lower() not in service.name.lower():
-            return False
-
-        # Check status
-        if query.status and service.status != query.status:
-            return False
-
-        # Check tags
-        if query.tags:
-            service_tags = set(service.metadata.tags)
-            query_tags = set(query.tags)
-            if not query_tags.issubset(service_tags):
-                return False
+        if query.name:
+            name_needle = query.name.lower()
+            checks.append(lambda s: name_needle in s.name_lower)
 
         # Check capabilities
         if query.capabilities:
-            service_capabilities = set(service.metadata.capabilities)
-            query_capabilities = set(query.capabilities)
-            if not query_capabilities.issubset(service_capabilities):
-                return False
+            query_capabilities = frozenset(query.capabilities)
+            checks.append(lambda s: query_capabilities.issubset(s.capability_set))
 
-        return True
+        if not checks:
+            return lambda s: True
+        if len(checks) == 1:
+            return checks[0]
+        return lambda s: all(check(s) for check in checks)
 
     async def get_service(self, service_id: str) -> Optional[ServiceInfo]:
         """Get service information by ID.
@@ -263,83 +447,376 @@ class ServiceRegistry:
         if service_id not in self.services:
             return False
 
-        self.services[service_id].last_heartbeat = datetime.utcnow()
-
-        # Update in Zookeeper
-        zk_path = f"{settings.services_root_path}/{service_id}"
-        self.zk_client.update_node_data(zk_path, self.services[service_id].model_dump())
+        # In-memory only; the liveness flush loop persists it in bulk
+        now = clock.utcnow()
+        self.services[service_id].mark_heartbeat(now, time.monotonic_ns())
+        self._pending_heartbeats[service_id] = now
 
         return True
 
-    def get_registry_stats(self) -> RegistryStats:
-        """Get registry statistics."""
-        services_by_type = {}
-        services_by_status = {}
+    def subscribe_events(self) -> asyncio.Queue:
+        """Subscribe to service change events.
 
-        for service in self.services.values():
-            # Count by type
-            if service.service_type not in services_by_type:
-                services_by_type[service.service_type] = 0
-            services_by_type[service.service_type] += 1
+        Returns:
+            Queue receiving one event dict per service change
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.event_queue_size)
+        self._event_subscribers.add(queue)
+        return queue
+
+    def unsubscribe_events(self, queue: asyncio.Queue) -> None:
+        """Remove an event subscriber queue."""
+        self._event_subscribers.discard(queue)
 
-            # Count by status
-            if service.status not in services_by_status:
-                services_by_status[service.status] = 0
-            services_by_status[service.status] += 1
+    def _publish_event(self, service_id: Optional[str], change: str) -> None:
+        """Push a service change event to all subscribers.
 
-        healthy_count = services_by_status.get(ServiceStatus.HEALTHY, 0)
+        Must be called on the registry event loop.
+        """
+        event: Dict[str, Any] = {
+            "type": "service_changed",
+            "service_id": service_id,
+            "change": change,
+        }
+        for queue in self._event_subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: replace its backlog with a single reset event
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "services_reset", "service_id": None})
+
+    def get_registry_stats(self) -> RegistryStats:
+        """Get registry statistics."""
+        healthy_count = len(self._by_status.get(ServiceStatus.HEALTHY, ()))
         total_count = len(self.services)
         unhealthy_count = total_count - healthy_count
 
         return RegistryStats(
             total_services=total_count,
-            services_by_type=services_by_type,
-            services_by_status=services_by_status,
+            services_by_type={t: len(ids) for t, ids in self._by_type.items()},
+            services_by_status={st: len(ids) for st, ids in self._by_status.items()},
             healthy_services=healthy_count,
             unhealthy_services=unhealthy_count,
         )
 
+    def _add_service(self, service_info: ServiceInfo) -> None:
+        """Add a service to the local cache and the secondary indexes."""
+        if service_info.service_id in self.services:
+            self._remove_service(service_info.service_id)
+
+        self.services[service_info.service_id] = service_info
+        with self._service_id_lock:
+            self._service_id_set.add(service_info.service_id)
+        service_id = service_info.service_id
+        self._by_type[service_info.service_type].add(service_id)
+        self._by_status[service_info.status].add(service_id)
+        for tag in service_info.tag_set:
+            self._by_tag[tag].add(service_id)
+
+    def _remove_service(self, service_id: str) -> Optional[ServiceInfo]:
+        """Remove a service from the local cache and the secondary indexes."""
+        service_info = self.services.pop(service_id, None)
+        if service_info is None:
+            return None
+
+        with self._service_id_lock:
+            self._service_id_set.discard(service_id)
+        _index_discard(self._by_type, service_info.service_type, service_id)
+        _index_discard(self._by_status, service_info.status, service_id)
+        for tag in service_info.tag_set:
+            _index_discard(self._by_tag, tag, service_id)
+        self._pending_heartbeats.pop(service_id, None)
+        self._dirty_services.discard(service_id)
+        self._status_changed_at.pop(service_id, None)
+        self._snapshot_dirty.set()
+        return service_info
+
     async def _load_services_from_zk(self) -> None:
-        """Load existing services from Zookeeper."""
-        try:
-            service_ids = self.zk_client.get_children(settings.services_root_path)
+        """Load existing services from Zookeeper.
 
-            for service_id in service_ids:
-                zk_path = f"{settings.services_root_path}/{service_id}"
-                service_data = self.zk_client.get_node_data(zk_path)
+        Alive services are read from the snapshot in one go; services missing
+        from it (registered since its last write) are read from their own
+        znodes.
+        """
+        try:
+            children = await self.zk_client.get_children(settings.services_root_path)
+            service_ids = [child for child in children if not child.startswith("_")]
+
+            alive_ids = set(service_ids)
+            (snapshot_raw,) = await self.zk_client.get_nodes_raw([self._snapshot_path])
+            for entry in decode_payload(snapshot_raw) if snapshot_raw else []:
+                if entry.get("service_id") not in alive_ids:
+                    continue
+                try:
+                    service_info = ServiceInfo.model_validate(entry)
+                except (TypeError, ValueError):
+                    logger.warning(
+                        f"Skipping invalid snapshot entry: {entry.get('service_id')}"
+                    )
+                    continue
+                self._add_service(service_info)
+
+            service_ids = [
+                service_id
+                for service_id in service_ids
+                if service_id not in self._service_id_set
+            ]
+            paths = [self._root + service_id for service_id in service_ids]
+            raw_payloads = await self.zk_client.get_nodes_raw(paths)
+
+            loaded = [
+                (service_id, raw)
+                for service_id, raw in zip(service_ids, raw_payloads)
+                if raw
+            ]
+            payloads = [raw for _, raw in loaded]
+            if payloads:
+                # Fold services missing from the snapshot into it
+                self._snapshot_dirty.set()
+
+            # Validation is CPU-bound; spread big registries across processes
+            if len(payloads) >= settings.parallel_parse_threshold:
+                loop = asyncio.get_running_loop()
+                pool = _get_parse_pool()
+                workers = os.cpu_count() or 1
+                chunk_size = -(-len(payloads) // workers)
+                chunks = await asyncio.gather(
+                    *[
+                        loop.run_in_executor(
+                            pool,
+                            _parse_service_infos,
+                            payloads[i : i + chunk_size],
+                        )
+                        for i in range(0, len(payloads), chunk_size)
+                    ]
+                )
+                parsed = list(chain.from_iterable(chunks))
+            else:
+                parsed = _parse_service_infos(payloads)
 
-                if service_data:
-                    service_info = ServiceInfo(**service_data)
-                    self.services[service_id] = service_info
-                    logger.debug(f"Loaded service from ZK: {service_info.name}")
+            for (service_id, _), service_info in zip(loaded, parsed):
+                if service_info is None:
+                    logger.warning(f"Skipping invalid service data in ZK: {service_id}")
+                    continue
+                self._add_service(service_info)
+                logger.debug(f"Loaded service from ZK: {service_info.name}")
 
             logger.info(f"Loaded {len(self.services)} services from Zookeeper")
 
         except Exception as e:
             logger.error(f"Failed to load services from Zookeeper: {e}")
 
-    def _on_services_changed(self, children: List[str]) -> None:
-        """Handle changes in service nodes."""
-        current_ids = set(self.services.keys())
-        zk_ids = set(children)
-
-        # Handle removed services
-        removed_ids = current_ids - zk_ids
-        for service_id in removed_ids:
-            if service_id in self.services:
-                service_info = self.services.pop(service_id)
-                logger.info(f"Service removed: {service_info.name} ({service_id})")
-
-        # Handle new services
-        new_ids = zk_ids - current_ids
-        for service_id in new_ids:
-            zk_path = f"{settings.services_root_path}/{service_id}"
-            service_data = self.zk_client.get_node_data(zk_path)
-
-            if service_data:
-                service_info = ServiceInfo(**service_data)
-                self.services[service_id] = service_info
+    def _is_unknown_service_node(self, child: str) -> bool:
+        """Tell whether the data of a service child node must be fetched.
+
+        Runs on a kazoo thread.
+        """
+        # Underscore-prefixed children are registry bookkeeping nodes
+        if child.startswith("_"):
+            return False
+        with self._service_id_lock:
+            return child not in self._service_id_set
+
+    def _on_services_changed(
+        self, children: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> None:
+        """Handle changes in service nodes.
+
+        Runs on a kazoo thread: only the diff is computed here, the changes
+        are applied on the registry event loop. Data of new services arrives
+        with the children, already read in one batch.
+        """
+        zk_ids = {child for child, _ in children if not child.startswith("_")}
+        # Diff against the live set under the lock instead of copying it
+        with self._service_id_lock:
+            removed_ids = self._service_id_set - zk_ids
+            new_services = {
+                child: data
+                for child, data in children
+                if data is not None and child not in self._service_id_set
+            }
+
+        if (removed_ids or new_services) and self._loop:
+            asyncio.run_coroutine_threadsafe(
+                self._apply_service_changes(removed_ids, new_services), self._loop
+            )
+
+    async def _apply_service_changes(
+        self, removed_ids: Set[str], new_services: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Apply service node changes seen by the children watcher."""
+        try:
+            # Handle removed services
+            for service_id in removed_ids:
+                service_info = self._remove_service(service_id)
+                if service_info:
+                    logger.info(f"Service removed: {service_info.name} ({service_id})")
+                    self._publish_event(service_id, "removed")
+
+            for service_id, service_data in new_services.items():
+                # Skip services registered meanwhile
+                if service_id in self._service_id_set:
+                    continue
+
+                try:
+                    service_info = ServiceInfo(**service_data)
+                except Exception as e:
+                    logger.error(f"Invalid data for new service {service_id}: {e}")
+                    continue
+                self._add_service(service_info)
+                self._snapshot_dirty.set()
                 logger.info(f"New service detected: {service_info.name} ({service_id})")
+                self._publish_event(service_id, "added")
+        except Exception as e:
+            logger.error(f"Failed to apply service changes: {e}")
+
+    def _apply_liveness(self, liveness: Dict[str, str]) -> None:
+        """Seed last_heartbeat of loaded services from the liveness map."""
+        for service_id, timestamp in liveness.items():
+            service_info = self.services.get(service_id)
+            if service_info is None:
+                continue
+            last_heartbeat = naive_utc(datetime.fromisoformat(timestamp))
+            if last_heartbeat > service_info.last_heartbeat:
+                service_info.mark_heartbeat(last_heartbeat)
+
+    async def _flush_pending_writes(self) -> None:
+        """Write deferred status changes and the liveness map to Zookeeper.
+
+        Payloads are built on the event loop; all writes of one flush then go
+        out as a single versioned ZK multi transaction on the Zookeeper thread
+        pool, merged with whatever other replicas wrote meanwhile.
+        """
+        updates: Dict[str, Callable[[Optional[bytes]], bytes]] = {}
+        if self._dirty_services:
+            self._dirty_services = set()
+            self._snapshot_dirty.clear()
+            updates[self._snapshot_path] = self._snapshot_merger()
+
+        if self._pending_heartbeats:
+            self._pending_heartbeats.clear()
+            updates[self._liveness_path] = self._liveness_merger()
+
+        if not updates:
+            return
+
+        try:
+            await self.zk_client.merge_nodes(updates)
+        except Exception as e:
+            logger.error(f"Failed to flush pending writes to ZK: {e}")
+
+    def _alive_service_ids(self) -> Set[str]:
+        """Read the IDs of services whose ephemeral znode exists.
+
+        Blocking; only called from merge functions on the Zookeeper threads.
+        """
+        children = self.zk_client._get_children(settings.services_root_path)
+        return {child for child in children if not child.startswith("_")}
+
+    def _snapshot_merger(self) -> Callable[[Optional[bytes]], bytes]:
+        """Build the merge function writing this replica's snapshot.
+
+        Local services win; entries written by other replicas for services
+        this one has not seen yet are kept while their znode is alive.
+        """
+        encode = self.zk_client.encode
+        local_items = [
+            service_info.encode(encode) for service_info in self.services.values()
+        ]
+        local_ids = frozenset(self.services)
+
+        def merge(current: Optional[bytes]) -> bytes:
+            foreign = [
+                entry
+                for entry in (decode_payload(current) if current else [])
+                if entry.get("service_id") not in local_ids
+            ]
+            if foreign:
+                alive_ids = self._alive_service_ids()
+                foreign = [
+                    entry for entry in foreign if entry["service_id"] in alive_ids
+                ]
+            return self.zk_client.encode_array(
+                local_items + [encode(entry) for entry in foreign]
+            )
+
+        return merge
+
+    def _liveness_merger(self) -> Callable[[Optional[bytes]], bytes]:
+        """Build the merge function writing this replica's liveness map.
+
+        The latest heartbeat wins per service, so a replica that has not seen
+        a service's recent heartbeats cannot roll them back.
+        """
+        local = {
+            service_id: service_info.last_heartbeat
+            for service_id, service_info in self.services.items()
+        }
+
+        def merge(current: Optional[bytes]) -> bytes:
+            merged = dict(local)
+            remote = decode_payload(current) if current else {}
+            foreign_ids = remote.keys() - local.keys()
+            alive_ids = self._alive_service_ids() if foreign_ids else set()
+            for service_id, timestamp in remote.items():
+                if service_id not in local and service_id not in alive_ids:
+                    continue
+                last_heartbeat = naive_utc(datetime.fromisoformat(timestamp))
+                if service_id not in merged or last_heartbeat > merged[service_id]:
+                    merged[service_id] = last_heartbeat
+            return self.zk_client.encode(
+                {
+                    service_id: last_heartbeat.isoformat()
+                    for service_id, last_heartbeat in merged.items()
+                }
+            )
+
+        return merge
+
+    async def _write_snapshot(self) -> None:
+        """Write the services snapshot to Zookeeper.
+
+        The snapshot carries every current status, so deferred status changes
+        are written with it.
+        """
+        self._snapshot_dirty.clear()
+        self._dirty_services = set()
+        try:
+            await self.zk_client.merge_nodes(
+                {self._snapshot_path: self._snapshot_merger()}
+            )
+        except Exception as e:
+            logger.error(f"Failed to write services snapshot to ZK: {e}")
+
+    async def _snapshot_writer_loop(self) -> None:
+        """Background task writing the snapshot, at most once per window.
+
+        Changes arriving while a window is open are folded into one write.
+        """
+        while self._running:
+            try:
+                await self._snapshot_dirty.wait()
+                await asyncio.sleep(settings.snapshot_coalesce_window)
+                # A pending write flush may have written it meanwhile
+                if self._snapshot_dirty.is_set():
+                    await self._write_snapshot()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in snapshot writer loop: {e}")
+
+    async def _flush_pending_loop(self) -> None:
+        """Background task flushing deferred writes once per check interval."""
+        while self._running:
+            try:
+                await asyncio.sleep(settings.health_check_interval)
+                await self._flush_pending_writes()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in pending write flush loop: {e}")
 
     async def _health_check_loop(self) -> None:
         """Background task for health checking services."""
@@ -362,16 +839,46 @@ class ServiceRegistry:
         if not self.services:
             return
 
-        # Create health check tasks
-        tasks = []
-        for service_info in self.services.values():
-            if service_info.health_check.enabled:
-                task = asyncio.create_task(self._check_service_health(service_info))
-                tasks.append(task)
-
-        if tasks:
-            # Wait for all health checks to complete
-            await asyncio.gather(*tasks, return_exceptions=True)
+        # Services whose status just flipped were probed moments ago
+        debounce_ns = settings.health_check_interval * 500_000_000
+        now_ns = time.monotonic_ns()
+
+        async with asyncio.TaskGroup() as tg:
+            for service_info in list(self.services.values()):
+                if not service_info.health_check.enabled:
+                    continue
+                changed_ns = self._status_changed_at.get(service_info.service_id)
+                if changed_ns is not None and now_ns - changed_ns < debounce_ns:
+                    continue
+                tg.create_task(self._check_service_health_bounded(service_info))
+
+    async def _check_service_health_bounded(self, service_info: ServiceInfo) -> None:
+        """Check health of a service under the health check concurrency limit."""
+        async with self._health_sema:
+            await self._check_service_health(service_info)
+
+    def _set_status(self, service_info: ServiceInfo, status: ServiceStatus) -> None:
+        """Change a service status, recording when the transition happened."""
+        service_id = service_info.service_id
+        if service_id in self.services:
+            _index_discard(self._by_status, service_info.status, service_id)
+            self._by_status[status].add(service_id)
+        service_info.status = status
+        self._status_changed_at[service_info.service_id] = time.monotonic_ns()
+
+    def _set_metadata(
+        self, service_info: ServiceInfo, metadata: ServiceMetadata
+    ) -> None:
+        """Replace service metadata, moving the service between tag indexes."""
+        service_id = service_info.service_id
+        old_tags = service_info.tag_set
+        service_info.metadata = metadata
+        if service_id not in self.services:
+            return
+        for tag in old_tags - service_info.tag_set:
+            _index_discard(self._by_tag, tag, service_id)
+        for tag in service_info.tag_set - old_tags:
+            self._by_tag[tag].add(service_id)
 
     async def _check_service_health(self, service_info: ServiceInfo) -> None:
         """Check health of a single service."""
@@ -386,13 +893,13 @@ class ServiceRegistry:
 
                 if response.status_code == 200:
                     if service_info.status != ServiceStatus.HEALTHY:
-                        service_info.status = ServiceStatus.HEALTHY
-                        service_info.last_heartbeat = datetime.utcnow()
+                        self._set_status(service_info, ServiceStatus.HEALTHY)
+                        service_info.mark_heartbeat(clock.utcnow(), time.monotonic_ns())
                         await self._update_service_in_zk(service_info)
                         logger.info(f"Service health restored: {service_info.name}")
                 else:
                     if service_info.status != ServiceStatus.UNHEALTHY:
-                        service_info.status = ServiceStatus.UNHEALTHY
+                        self._set_status(service_info, ServiceStatus.UNHEALTHY)
                         await self._update_service_in_zk(service_info)
                         logger.warning(
                             f"Service unhealthy (HTTP {response.status_code}): {service_info.name}"
@@ -400,7 +907,7 @@ class ServiceRegistry:
 
         except Exception as e:
             if service_info.status != ServiceStatus.UNHEALTHY:
-                service_info.status = ServiceStatus.UNHEALTHY
+                self._set_status(service_info, ServiceStatus.UNHEALTHY)
                 await self._update_service_in_zk(service_info)
                 logger.warning(
                     f"Service health check failed: {service_info.name} - {e}"
@@ -408,19 +915,17 @@ class ServiceRegistry:
 
     async def _update_service_in_zk(self, service_info: ServiceInfo) -> None:
         """Update service information in Zookeeper."""
-        try:
-            zk_path = f"{settings.services_root_path}/{service_info.service_id}"
-            self.zk_client.update_node_data(zk_path, service_info.model_dump())
-        except Exception as e:
-            logger.error(f"Failed to update service in ZK: {e}")
+        self._publish_event(service_info.service_id, "updated")
+        self._dirty_services.discard(service_info.service_id)
+        self._snapshot_dirty.set()
 
     async def cleanup_stale_services(self) -> int:
         """Remove stale services that haven't sent heartbeat recently."""
-        cutoff_time = datetime.utcnow() - timedelta(seconds=settings.service_ttl)
+        cutoff_ns = time.monotonic_ns() - settings.service_ttl * 1_000_000_000
         stale_services = []
 
         for service_id, service_info in self.services.items():
-            if service_info.last_heartbeat < cutoff_time:
+            if service_info.last_heartbeat_ns < cutoff_ns:
                 stale_services.append(service_id)
 
         # Remove stale services
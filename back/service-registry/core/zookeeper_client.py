@@ -1,48 +1,135 @@
 """Zookeeper client for service coordination."""
 
-import json
+import asyncio
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple, Union
+from uuid import UUID
+import ormsgpack
 from kazoo.client import KazooClient
 from kazoo.protocol.states import EventType, KazooState
-from kazoo.exceptions import NoNodeError, NodeExistsError
+from kazoo.exceptions import (
+    BadVersionError,
+    NoNodeError,
+    NodeExistsError,
+    RolledBackError,
+)
 
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
 
-def serialize_for_json(obj: Any) -> Any:
-    """Convert datetime objects to strings for JSON serialization."""
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    import json
+
+    orjson = None
+
+# Leading byte of MessagePack payloads. JSON payloads always start with a
+# printable character, so legacy JSON znodes remain readable during rollout.
+MSGPACK_PAYLOAD_VERSION = b"\x01"
+
+# Threads serving blocking kazoo calls issued from coroutines
+ZK_EXECUTOR_WORKERS = 8
+
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values the encoders do not support natively.
+
+    Only called for non-native values, so payloads need no pre-walk. Shared
+    by the encoders so they decode to the same data.
+    """
     if isinstance(obj, datetime):
         return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [serialize_for_json(item) for item in obj]
-    else:
-        return obj
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is None:
+    # Reused across calls instead of rebuilding encoder state per json.dumps
+    _ENCODE = json.JSONEncoder(
+        default=_json_default, separators=(",", ":"), ensure_ascii=False
+    ).encode
+    _DECODE = json.JSONDecoder().decode
+
+
+def encode_payload(data: Any, codec: str = CODEC_MSGPACK) -> bytes:
+    """Encode node data.
+
+    Args:
+        data: JSON-compatible data
+        codec: CODEC_MSGPACK for version-prefixed MessagePack, CODEC_JSON
+            for plain JSON
+
+    Returns:
+        Encoded payload
+    """
+    if codec == CODEC_MSGPACK:
+        # ormsgpack writes datetimes and UUIDs as the same strings as the
+        # JSON encoders
+        return MSGPACK_PAYLOAD_VERSION + ormsgpack.packb(data, default=_json_default)
+    if orjson is not None:
+        return orjson.dumps(data)
+    return _ENCODE(data).encode("utf-8")
+
+
+def _msgpack_array_header(length: int) -> bytes:
+    """Build the MessagePack header of an array with `length` items."""
+    if length < 16:
+        return bytes([0x90 | length])
+    if length < 0x10000:
+        return b"\xdc" + struct.pack(">H", length)
+    return b"\xdd" + struct.pack(">I", length)
+
+
+def decode_payload(data: bytes) -> Any:
+    """Decode node data written in either MessagePack or JSON format."""
+    if data[:1] == MSGPACK_PAYLOAD_VERSION:
+        return ormsgpack.unpackb(data[1:])
+    if orjson is not None:
+        return orjson.loads(data)
+    return _DECODE(data.decode("utf-8"))
 
 
 class ZookeeperClient:
     """Zookeeper client for distributed coordination and service discovery."""
 
-    def __init__(self, hosts: str, timeout: int = 10):
+    def __init__(self, hosts: str, timeout: int = 10, codec: str = CODEC_MSGPACK):
         """Initialize Zookeeper client.
 
         Args:
             hosts: Comma-separated list of Zookeeper hosts
             timeout: Connection timeout in seconds
+            codec: Payload format for writes; reads accept either format
         """
         self.hosts = hosts
         self.timeout = timeout
+        self.codec = codec
         self.client: Optional[KazooClient] = None
         self._connected = False
         self._watchers: Dict[str, List[Callable]] = {}
 
+        # Decoded node data and version, kept current by a DataWatch per path
+        self._data_cache: Dict[str, Tuple[Optional[Dict], int]] = {}
+        self._data_cache_lock = threading.Lock()
+
+        # Blocking kazoo calls made from coroutines run here, off the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
+
     async def connect(self) -> None:
         """Connect to Zookeeper cluster."""
         try:
+            self._executor = ThreadPoolExecutor(
+                max_workers=ZK_EXECUTOR_WORKERS, thread_name_prefix="zk"
+            )
             self.client = KazooClient(
                 hosts=self.hosts, timeout=self.timeout, logger=logger
             )
@@ -51,7 +138,7 @@ class ZookeeperClient:
             self.client.add_listener(self._connection_listener)
 
             # Start the client
-            self.client.start(timeout=self.timeout)
+            await self.run(self.client.start, self.timeout)
             self._connected = True
 
             logger.info(f"Connected to Zookeeper at {self.hosts}")
@@ -63,10 +150,14 @@ class ZookeeperClient:
     async def disconnect(self) -> None:
         """Disconnect from Zookeeper cluster."""
         if self.client:
-            self.client.stop()
-            self.client.close()
+            await self.run(self.client.stop)
+            await self.run(self.client.close)
             self._connected = False
+            self._data_cache.clear()
             logger.info("Disconnected from Zookeeper")
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def _connection_listener(self, state: KazooState) -> None:
         """Handle Zookeeper connection state changes."""
@@ -80,43 +171,177 @@ class ZookeeperClient:
             logger.info("Zookeeper connection established")
             self._connected = True
 
+    def encode(self, data: Any) -> bytes:
+        """Encode node data with the configured codec."""
+        return encode_payload(data, self.codec)
+
+    def encode_array(self, items: List[bytes]) -> bytes:
+        """Join payloads produced by encode() into one array payload.
+
+        The items are spliced in without being decoded, so cached per-item
+        payloads can be reused.
+
+        Args:
+            items: Payloads encoded with this client's codec
+
+        Returns:
+            Payload decoding to the list of the decoded items
+        """
+        if self.codec == CODEC_MSGPACK:
+            prefix_len = len(MSGPACK_PAYLOAD_VERSION)
+            return b"".join(
+                [
+                    MSGPACK_PAYLOAD_VERSION,
+                    _msgpack_array_header(len(items)),
+                    *[item[prefix_len:] for item in items],
+                ]
+            )
+        return b"[" + b",".join(items) + b"]"
+
+    def _encode(self, data: Union[Dict, bytes]) -> bytes:
+        """Encode node data, passing pre-encoded payloads through untouched."""
+        if isinstance(data, bytes):
+            return data
+        return encode_payload(data, self.codec)
+
     def is_connected(self) -> bool:
         """Check if connected to Zookeeper."""
         return self._connected and self.client is not None
 
-    def ensure_path(self, path: str) -> None:
-        """Ensure a path exists in Zookeeper."""
-        if not self.client:
-            raise RuntimeError("Not connected to Zookeeper")
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call on the Zookeeper thread pool.
 
-        try:
-            self.client.ensure_path(path)
-            logger.debug(f"Ensured path exists: {path}")
-        except Exception as e:
-            logger.error(f"Failed to ensure path {path}: {e}")
-            raise
+        Args:
+            func: Blocking callable, typically a kazoo or batch operation
+            *args: Positional arguments for func
 
-    def create_node(
-        self, path: str, data: Dict, ephemeral: bool = True, sequence: bool = False
+        Returns:
+            Result of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def ensure_path(self, path: str) -> None:
+        """Ensure a path exists in Zookeeper."""
+        await self.run(self._ensure_path, path)
+
+    async def create_node(
+        self,
+        path: str,
+        data: Union[Dict, bytes],
+        ephemeral: bool = True,
+        sequence: bool = False,
     ) -> str:
         """Create a node in Zookeeper.
 
         Args:
             path: Node path
-            data: Node data as dictionary
+            data: Node data as dictionary or pre-encoded payload bytes
             ephemeral: Whether node is ephemeral (deleted on disconnect)
             sequence: Whether to append sequence number to path
 
         Returns:
             Actual path of created node
         """
+        return await self.run(self._create_node, path, data, ephemeral, sequence)
+
+    async def get_node_data(self, path: str) -> Optional[Dict]:
+        """Get data from a Zookeeper node, served locally once cached.
+
+        Args:
+            path: Node path
+
+        Returns:
+            Node data as dictionary or None if not found
+        """
+        cached = self._data_cache.get(path)
+        if cached is not None:
+            return cached[0]
+        return await self.run(self._get_node_data, path)
+
+    async def get_nodes_raw(self, paths: List[str]) -> List[Optional[bytes]]:
+        """Fetch the raw payloads of several nodes in one pipelined round.
+
+        Args:
+            paths: Node paths
+
+        Returns:
+            Raw node payloads in the same order, None for missing nodes
+        """
+        return await self.run(self._get_nodes_raw, paths)
+
+    async def update_node_data(self, path: str, data: Union[Dict, bytes]) -> None:
+        """Update data in a Zookeeper node.
+
+        Args:
+            path: Node path
+            data: New data as dictionary or pre-encoded payload bytes
+        """
+        await self.run(self._update_node_data, path, data)
+
+    async def merge_nodes(
+        self,
+        updates: Dict[str, Callable[[Optional[bytes]], bytes]],
+        attempts: int = 5,
+    ) -> None:
+        """Read-modify-write several nodes in one versioned transaction.
+
+        Each node is written with the version it was read at, so a concurrent
+        writer makes the transaction fail instead of being overwritten; the
+        nodes are then re-read and merged again.
+
+        Args:
+            updates: Node path -> function building the new payload from the
+                current raw payload (None when the node is empty)
+            attempts: Maximum number of read-merge-write rounds
+        """
+        await self.run(self._merge_nodes, updates, attempts)
+
+    async def delete_node(self, path: str, recursive: bool = False) -> None:
+        """Delete a node from Zookeeper.
+
+        Args:
+            path: Node path
+            recursive: Whether to delete recursively
+        """
+        await self.run(self._delete_node, path, recursive)
+
+    async def get_children(self, path: str) -> List[str]:
+        """Get children of a Zookeeper node.
+
+        Args:
+            path: Parent node path
+
+        Returns:
+            List of child node names
+        """
+        return await self.run(self._get_children, path)
+
+    def _ensure_path(self, path: str) -> None:
+        """Blocking implementation of ensure_path."""
         if not self.client:
             raise RuntimeError("Not connected to Zookeeper")
 
         try:
-            # Serialize datetime objects before JSON encoding
-            serializable_data = serialize_for_json(data)
-            json_data = json.dumps(serializable_data).encode("utf-8")
+            self.client.ensure_path(path)
+            logger.debug(f"Ensured path exists: {path}")
+        except Exception as e:
+            logger.error(f"Failed to ensure path {path}: {e}")
+            raise
+
+    def _create_node(
+        self,
+        path: str,
+        data: Union[Dict, bytes],
+        ephemeral: bool = True,
+        sequence: bool = False,
+    ) -> str:
+        """Blocking implementation of create_node."""
+        if not self.client:
+            raise RuntimeError("Not connected to Zookeeper")
+
+        try:
+            json_data = self._encode(data)
             actual_path = self.client.create(
                 path, json_data, ephemeral=ephemeral, sequence=sequence, makepath=True
             )
@@ -130,45 +355,84 @@ class ZookeeperClient:
             logger.error(f"Failed to create node {path}: {e}")
             raise
 
-    def get_node_data(self, path: str) -> Optional[Dict]:
-        """Get data from a Zookeeper node.
+    def _get_node_data(self, path: str) -> Optional[Dict]:
+        """Blocking implementation of get_node_data.
 
-        Args:
-            path: Node path
-
-        Returns:
-            Node data as dictionary or None if not found
+        The first read of a path installs a DataWatch that keeps a local copy
+        current, so later reads are served without a round-trip. The returned
+        dictionary is shared and must not be mutated.
         """
         if not self.client:
             raise RuntimeError("Not connected to Zookeeper")
 
-        try:
-            data, stat = self.client.get(path)
-            if data:
-                return json.loads(data.decode("utf-8"))
-            return None
+        cached = self._data_cache.get(path)
+        if cached is not None:
+            return cached[0]
 
-        except NoNodeError:
-            logger.debug(f"Node not found: {path}")
-            return None
+        try:
+            # DataWatch performs the initial read synchronously
+            self.client.DataWatch(path, self._cache_watcher(path))
         except Exception as e:
             logger.error(f"Failed to get node data from {path}: {e}")
             raise
 
-    def update_node_data(self, path: str, data: Dict) -> None:
-        """Update data in a Zookeeper node.
+        cached = self._data_cache.get(path)
+        if cached is None:
+            logger.debug(f"Node not found: {path}")
+            return None
+        return cached[0]
+
+    def _cache_watcher(self, path: str) -> Callable:
+        """Build the DataWatch callback maintaining the cache entry of a path."""
+
+        def watcher(data, stat, event=None):
+            with self._data_cache_lock:
+                if stat is None:
+                    # Node deleted (or never existed); stop watching it
+                    self._data_cache.pop(path, None)
+                    return False
+                cached = self._data_cache.get(path)
+                if cached is not None and cached[1] >= stat.version:
+                    return None
+                try:
+                    node_data = decode_payload(data) if data else None
+                except Exception as e:
+                    logger.error(f"Failed to decode node data from {path}: {e}")
+                    self._data_cache.pop(path, None)
+                    return False
+                self._data_cache[path] = (node_data, stat.version)
+            return None
 
-        Args:
-            path: Node path
-            data: New data as dictionary
+        return watcher
+
+    def _get_nodes_raw(self, paths: List[str]) -> List[Optional[bytes]]:
+        """Blocking implementation of get_nodes_raw.
+
+        All reads are issued asynchronously before any result is awaited, so
+        the requests share the session's connection instead of paying one
+        round-trip each.
         """
         if not self.client:
             raise RuntimeError("Not connected to Zookeeper")
 
+        pending = [self.client.get_async(path) for path in paths]
+        results: List[Optional[bytes]] = []
+        for path, async_result in zip(paths, pending):
+            try:
+                data, _ = async_result.get()
+                results.append(data or None)
+            except NoNodeError:
+                logger.debug(f"Node not found: {path}")
+                results.append(None)
+        return results
+
+    def _update_node_data(self, path: str, data: Union[Dict, bytes]) -> None:
+        """Blocking implementation of update_node_data."""
+        if not self.client:
+            raise RuntimeError("Not connected to Zookeeper")
+
         try:
-            # Serialize datetime objects before JSON encoding
-            serializable_data = serialize_for_json(data)
-            json_data = json.dumps(serializable_data).encode("utf-8")
+            json_data = self._encode(data)
             self.client.set(path, json_data)
             logger.debug(f"Updated node data: {path}")
 
@@ -179,13 +443,44 @@ class ZookeeperClient:
             logger.error(f"Failed to update node {path}: {e}")
             raise
 
-    def delete_node(self, path: str, recursive: bool = False) -> None:
-        """Delete a node from Zookeeper.
+    def _merge_nodes(
+        self,
+        updates: Dict[str, Callable[[Optional[bytes]], bytes]],
+        attempts: int,
+    ) -> None:
+        """Blocking implementation of merge_nodes."""
+        if not self.client:
+            raise RuntimeError("Not connected to Zookeeper")
 
-        Args:
-            path: Node path
-            recursive: Whether to delete recursively
-        """
+        paths = list(updates)
+        for _ in range(attempts):
+            pending = [self.client.get_async(path) for path in paths]
+            transaction = self.client.transaction()
+            for path, async_result in zip(paths, pending):
+                data, stat = async_result.get()
+                transaction.set_data(
+                    path, updates[path](data or None), version=stat.version
+                )
+
+            results = transaction.commit()
+            if not any(isinstance(result, Exception) for result in results):
+                logger.debug(f"Merged {len(paths)} nodes in one transaction")
+                return
+            # The failing operation carries the cause, the rest are rolled back
+            cause = next(
+                result
+                for result in results
+                if isinstance(result, Exception)
+                and not isinstance(result, RolledBackError)
+            )
+            if not isinstance(cause, BadVersionError):
+                raise cause
+            logger.debug(f"Concurrent write on {paths}, merging again")
+
+        raise BadVersionError(f"Gave up merging {paths} after {attempts} attempts")
+
+    def _delete_node(self, path: str, recursive: bool = False) -> None:
+        """Blocking implementation of delete_node."""
         if not self.client:
             raise RuntimeError("Not connected to Zookeeper")
 
@@ -199,15 +494,8 @@ class ZookeeperClient:
             logger.error(f"Failed to delete node {path}: {e}")
             raise
 
-    def get_children(self, path: str) -> List[str]:
-        """Get children of a Zookeeper node.
-
-        Args:
-            path: Parent node path
-
-        Returns:
-            List of child node names
-        """
+    def _get_children(self, path: str) -> List[str]:
+        """Blocking implementation of get_children."""
         if not self.client:
             raise RuntimeError("Not connected to Zookeeper")
 
@@ -222,12 +510,22 @@ class ZookeeperClient:
             logger.error(f"Failed to get children of {path}: {e}")
             raise
 
-    def watch_children(self, path: str, callback: Callable[[List[str]], None]) -> None:
+    def watch_children(
+        self,
+        path: str,
+        callback: Callable[[List], None],
+        fetch_data: bool = False,
+        fetch_filter: Optional[Callable[[str], bool]] = None,
+    ) -> None:
         """Watch for changes in child nodes.
 
         Args:
             path: Parent node path
             callback: Function to call when children change
+            fetch_data: Pass (child, data) tuples instead of child names, with
+                the data of all children read in one pipelined round
+            fetch_filter: With fetch_data, only children for which this
+                returns True are read; the others are passed with None data
         """
         if not self.client:
             raise RuntimeError("Not connected to Zookeeper")
@@ -235,6 +533,8 @@ class ZookeeperClient:
         def watcher(children):
             """Internal watcher function."""
             try:
+                if fetch_data:
+                    children = self._with_child_data(path, children, fetch_filter)
                 callback(children)
             except Exception as e:
                 logger.error(f"Error in children watcher callback: {e}")
@@ -253,6 +553,23 @@ class ZookeeperClient:
             logger.error(f"Failed to set up children watcher for {path}: {e}")
             raise
 
+    def _with_child_data(
+        self,
+        path: str,
+        children: List[str],
+        fetch_filter: Optional[Callable[[str], bool]],
+    ) -> List[Tuple[str, Optional[Dict]]]:
+        """Pair children with their decoded data, reading them in one round."""
+        to_fetch = [
+            child for child in children if fetch_filter is None or fetch_filter(child)
+        ]
+        raw = self._get_nodes_raw([f"{path}/{child}" for child in to_fetch])
+        fetched = {
+            child: decode_payload(data) if data else None
+            for child, data in zip(to_fetch, raw)
+        }
+        return [(child, fetched.get(child)) for child in children]
+
     def watch_node_data(self, path: str, callback: Callable[[Dict], None]) -> None:
         """Watch for changes in node data.
 
@@ -266,14 +583,10 @@ class ZookeeperClient:
         def watcher(data, stat, event):
             """Internal watcher function."""
             try:
-                if data and event is None:  # Initial data
-                    node_data = json.loads(data.decode("utf-8"))
-                    callback(node_data)
-                elif event and event.type == EventType.CHANGED:
-                    # Node data changed
-                    updated_data = self.get_node_data(path)
-                    if updated_data:
-                        callback(updated_data)
+                # DataWatch re-reads the node on every change, so the
+                # delivered bytes are already current
+                if data and (event is None or event.type == EventType.CHANGED):
+                    callback(decode_payload(data))
             except Exception as e:
                 logger.error(f"Error in data watcher callback: {e}")
 
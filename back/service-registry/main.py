@@ -5,16 +5,17 @@ This module provides a centralized service registry using Zookeeper for
 service discovery and coordination in a distributed microservices architecture.
 """
 
+import hmac
 from contextlib import asynccontextmanager
 from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from config.settings import settings
 from core.logging import setup_logging, get_logger
 from core.zookeeper_client import ZookeeperClient
-from core.service_registry import ServiceRegistry
+from core.service_registry import ServiceRegistry, heartbeat_token
 from api.endpoints import router
 
 # Setup logging
@@ -37,7 +38,9 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize Zookeeper client
         zk_client = ZookeeperClient(
-            hosts=settings.zookeeper_hosts, timeout=settings.zookeeper_timeout
+            hosts=settings.zookeeper_hosts,
+            timeout=settings.zookeeper_timeout,
+            codec=settings.znode_codec,
         )
 
         # Initialize service registry
@@ -88,6 +91,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def piggyback_heartbeat(request: Request, call_next):
+    """Treat a request carrying a valid X-Service-Id/X-Service-Token pair as
+    a heartbeat from that service.
+
+    X-Heartbeat-Recorded on the response tells the client it may skip its
+    next explicit heartbeat.
+    """
+    recorded = False
+    service_id = request.headers.get("x-service-id")
+    if service_id and registry:
+        expected = heartbeat_token(service_id)
+        token = request.headers.get("x-service-token", "")
+        if expected and hmac.compare_digest(token.encode(), expected.encode()):
+            recorded = await registry.heartbeat(service_id)
+    response = await call_next(request)
+    if recorded:
+        response.headers["X-Heartbeat-Recorded"] = "1"
+    return response
+
+
 # Include API router
 app.include_router(router, prefix="/api/v1", tags=["service-registry"])
 
@@ -11,6 +11,7 @@ from .service import (
     ServiceDiscoveryQuery,
     ServiceDiscoveryResponse,
     RegistryStats,
+    naive_utc,
 )
 
 __all__ = [
@@ -24,4 +25,5 @@ __all__ = [
     "ServiceDiscoveryQuery",
     "ServiceDiscoveryResponse",
     "RegistryStats",
+    "naive_utc",
 ]
@@ -1,11 +1,33 @@
 """Data models for service registry."""
 
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, FrozenSet, List, Optional, Any, Tuple
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    field_validator,
+)
 from enum import Enum
 
 
+def naive_utc(at: datetime) -> datetime:
+    """Convert a timestamp to naive UTC, the form datetime.utcnow() returns.
+
+    Args:
+        at: Naive (assumed UTC) or timezone-aware timestamp
+
+    Returns:
+        Naive UTC timestamp
+    """
+    if at.tzinfo is None:
+        return at
+    return at.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class ServiceStatus(str, Enum):
     """Service status enumeration."""
 
@@ -28,18 +50,30 @@ class ServiceType(str, Enum):
 
 
 class ServiceMetadata(BaseModel):
-    """Service metadata model."""
+    """Service metadata model.
+
+    Immutable, so values derived from it by ServiceInfo and the registry's
+    tag index cannot go stale; replace the whole metadata to change it.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     description: Optional[str] = None
     version: Optional[str] = None
-    tags: List[str] = Field(default_factory=list)
-    capabilities: List[str] = Field(default_factory=list)
-    dependencies: List[str] = Field(default_factory=list)
+    tags: Tuple[str, ...] = ()
+    capabilities: Tuple[str, ...] = ()
+    dependencies: Tuple[str, ...] = ()
     extra: Dict[str, Any] = Field(default_factory=dict)
 
 
 class HealthCheck(BaseModel):
-    """Health check configuration."""
+    """Health check configuration.
+
+    Immutable for the same reason as ServiceMetadata: health_url is derived
+    from it.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     enabled: bool = True
     endpoint: str = "/health"
@@ -62,15 +96,95 @@ class ServiceInfo(BaseModel):
     registered_at: datetime = Field(default_factory=datetime.utcnow)
     last_heartbeat: datetime = Field(default_factory=datetime.utcnow)
 
+    # Derived from host, port and health_check; recomputed when they are
+    # assigned, which is the only way they can change
+    base_url: str = ""
+    health_url: str = ""
+
+    # Lookup values used by discovery, derived from the public fields
+    _tag_set: FrozenSet[str] = PrivateAttr(default=frozenset())
+    _capability_set: FrozenSet[str] = PrivateAttr(default=frozenset())
+    _name_lower: str = PrivateAttr(default="")
+
+    # Monotonic counterpart of last_heartbeat, used for TTL arithmetic
+    _last_heartbeat_ns: int = PrivateAttr(default=0)
+
+    @field_validator("registered_at", "last_heartbeat")
+    @classmethod
+    def _to_naive_utc(cls, value: datetime) -> datetime:
+        """Keep timestamps comparable with datetime.utcnow() values."""
+        return naive_utc(value)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._refresh_derived()
+        self.mark_heartbeat(self.last_heartbeat)
+
+    def mark_heartbeat(self, at: datetime, at_ns: Optional[int] = None) -> None:
+        """Record a heartbeat.
+
+        Args:
+            at: Wall-clock time of the heartbeat; timezone-aware values are
+                stored as naive UTC
+            at_ns: Matching time.monotonic_ns() value; derived from the
+                wall-clock offset when omitted
+        """
+        at = naive_utc(at)
+        if at_ns is None:
+            age = datetime.utcnow() - at
+            at_ns = time.monotonic_ns() - int(age.total_seconds() * 1_000_000_000)
+        self.last_heartbeat = at
+        self._last_heartbeat_ns = at_ns
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in _DERIVED_SOURCE_FIELDS:
+            self._refresh_derived()
+
+    def _refresh_derived(self) -> None:
+        """Recompute the cached lookup values from the public fields."""
+        self._tag_set = frozenset(self.metadata.tags)
+        self._capability_set = frozenset(self.metadata.capabilities)
+        self._name_lower = self.name.lower()
+        self.base_url = f"http://{self.host}:{self.port}"
+        self.health_url = self.base_url + self.health_check.endpoint
+
+    def encode(self, encoder: Callable[[Any], bytes]) -> bytes:
+        """Serialize the service.
+
+        Not memoized: every payload carries last_heartbeat, which changes
+        between nearly all writes, and heartbeats themselves go to the
+        liveness map without encoding the service.
+
+        Args:
+            encoder: Encodes the JSON-mode dump of the service to bytes
+        """
+        return encoder(_service_info_adapter.dump_python(self, mode="json"))
+
     @property
-    def base_url(self) -> str:
-        """Get the base URL for the service."""
-        return f"http://{self.host}:{self.port}"
+    def last_heartbeat_ns(self) -> int:
+        """Get the last heartbeat as a time.monotonic_ns() value."""
+        return self._last_heartbeat_ns
 
     @property
-    def health_url(self) -> str:
-        """Get the health check URL for the service."""
-        return f"{self.base_url}{self.health_check.endpoint}"
+    def tag_set(self) -> FrozenSet[str]:
+        """Get the service tags as a frozenset."""
+        return self._tag_set
+
+    @property
+    def capability_set(self) -> FrozenSet[str]:
+        """Get the service capabilities as a frozenset."""
+        return self._capability_set
+
+    @property
+    def name_lower(self) -> str:
+        """Get the lowercased service name."""
+        return self._name_lower
+
+
+_DERIVED_SOURCE_FIELDS = frozenset({"name", "host", "port", "metadata", "health_check"})
+
+
+_service_info_adapter = TypeAdapter(ServiceInfo)
 
 
 class ServiceRegistration(BaseModel):
@@ -0,0 +1,18 @@
+import importlib.util
+import os
+import sys
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Service modules import each other from the service root (core, config, ...)
+sys.path.insert(0, SERVICE_ROOT)
+
+# The client package uses relative imports into models, so it is only
+# importable with the service root mounted as a package
+_spec = importlib.util.spec_from_file_location(
+    "service_registry",
+    os.path.join(SERVICE_ROOT, "__init__.py"),
+    submodule_search_locations=[SERVICE_ROOT],
+)
+sys.modules["service_registry"] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sys.modules["service_registry"])
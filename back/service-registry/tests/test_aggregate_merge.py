@@ -0,0 +1,71 @@
+"""Tests for merging the snapshot and liveness aggregates."""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("kazoo")
+pytest.importorskip("ormsgpack")
+pytest.importorskip("uuid_utils")
+
+from core.service_registry import ServiceRegistry  # noqa: E402
+from core.zookeeper_client import ZookeeperClient, decode_payload  # noqa: E402
+from models import ServiceInfo, ServiceType  # noqa: E402
+
+
+def _service(service_id: str, heartbeat: datetime) -> ServiceInfo:
+    return ServiceInfo(
+        service_id=service_id,
+        name=service_id,
+        service_type=ServiceType.AGENT,
+        host="localhost",
+        port=8000,
+        last_heartbeat=heartbeat,
+    )
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    zk_client = ZookeeperClient("localhost:2181")
+    # Alive znodes: ours (a), a foreign live one (b); c is gone
+    monkeypatch.setattr(
+        zk_client, "_get_children", lambda path: ["_snapshot", "a", "b"]
+    )
+    registry = ServiceRegistry(zk_client)
+    registry._add_service(_service("a", datetime(2026, 1, 1, 12)))
+    return registry
+
+
+def test_snapshot_merge_keeps_live_foreign_entries(registry):
+    encode = registry.zk_client.encode
+    current = registry.zk_client.encode_array(
+        [
+            encode({"service_id": "a", "name": "stale"}),
+            encode({"service_id": "b", "name": "b"}),
+            encode({"service_id": "c", "name": "c"}),
+        ]
+    )
+
+    merged = decode_payload(registry._snapshot_merger()(current))
+
+    assert [(e["service_id"], e["name"]) for e in merged] == [("a", "a"), ("b", "b")]
+
+
+def test_snapshot_merge_of_empty_node(registry):
+    merged = decode_payload(registry._snapshot_merger()(None))
+
+    assert [e["service_id"] for e in merged] == ["a"]
+
+
+def test_liveness_merge_keeps_latest_heartbeat(registry):
+    current = registry.zk_client.encode(
+        {
+            "a": "2026-01-01T13:00:00+00:00",
+            "b": "2026-01-01T10:00:00",
+            "c": "2026-01-01T10:00:00",
+        }
+    )
+
+    merged = decode_payload(registry._liveness_merger()(current))
+
+    assert merged == {"a": "2026-01-01T13:00:00", "b": "2026-01-01T10:00:00"}
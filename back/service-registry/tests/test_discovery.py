@@ -0,0 +1,86 @@
+"""Tests for ServiceRegistry discovery."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("kazoo")
+pytest.importorskip("httpx")
+pytest.importorskip("uuid_utils")
+pytest.importorskip("pydantic_settings")
+
+from core.service_registry import ServiceRegistry  # noqa: E402
+from models import (  # noqa: E402
+    ServiceDiscoveryQuery,
+    ServiceInfo,
+    ServiceStatus,
+    ServiceType,
+)
+
+
+def _registry(services) -> ServiceRegistry:
+    registry = ServiceRegistry(zk_client=None)
+    for service in services:
+        registry._add_service(service)
+    return registry
+
+
+def test_indexed_discovery_returns_registration_order():
+    base = datetime(2026, 1, 1)
+    # Legacy uuid4 IDs: their sort order says nothing about registration
+    ids = sorted(str(uuid.uuid4()) for _ in range(5))[::-1]
+    services = [
+        ServiceInfo(
+            service_id=service_id,
+            name=f"agent-{i}",
+            service_type=ServiceType.AGENT,
+            host="localhost",
+            port=8000 + i,
+            status=ServiceStatus.HEALTHY,
+            registered_at=base + timedelta(seconds=i),
+        )
+        for i, service_id in enumerate(ids)
+    ]
+    registry = _registry(reversed(services))
+
+    response = asyncio.run(
+        registry.discover_services(
+            ServiceDiscoveryQuery(service_type=ServiceType.AGENT)
+        )
+    )
+
+    assert [s.service_id for s in response.services] == ids
+
+
+def test_indexed_discovery_intersects_filters():
+    registry = _registry(
+        [
+            ServiceInfo(
+                service_id="a",
+                name="tool-agent",
+                service_type=ServiceType.AGENT,
+                host="localhost",
+                port=8000,
+                status=ServiceStatus.HEALTHY,
+                metadata={"tags": ["tools"]},
+            ),
+            ServiceInfo(
+                service_id="b",
+                name="router-agent",
+                service_type=ServiceType.AGENT,
+                host="localhost",
+                port=8001,
+                status=ServiceStatus.HEALTHY,
+            ),
+        ]
+    )
+
+    response = asyncio.run(
+        registry.discover_services(
+            ServiceDiscoveryQuery(service_type=ServiceType.AGENT, tags=["tools"])
+        )
+    )
+
+    assert [s.service_id for s in response.services] == ["a"]
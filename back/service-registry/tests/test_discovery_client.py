@@ -0,0 +1,138 @@
+"""Tests for the discovery client's registry event handling."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("orjson")
+pytest.importorskip("ormsgpack")
+pytest.importorskip("pydantic")
+
+from service_registry.client.discovery_client import (  # noqa: E402
+    ServiceDiscoveryClient,
+)
+from service_registry.models import (  # noqa: E402
+    ServiceRegistration,
+    ServiceStatus,
+    ServiceType,
+)
+
+
+def _client(handler) -> ServiceDiscoveryClient:
+    client = ServiceDiscoveryClient("http://registry")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_event_stream_invalidates_cache():
+    async def scenario():
+        def handler(request):
+            body = b'data: {"type": "service_changed", "change": "added"}\n\n'
+            return httpx.Response(200, content=body)
+
+        client = _client(handler)
+        client._cache[("key",)] = ([], 0.0)
+        client._start_events()
+        await asyncio.sleep(0.05)
+        cached = dict(client._cache)
+        await client.close()
+        return cached
+
+    assert asyncio.run(scenario()) == {}
+
+
+def test_event_stream_failure_is_logged(caplog):
+    async def scenario():
+        def handler(request):
+            return httpx.Response(503)
+
+        client = _client(handler)
+        client._start_events()
+        await asyncio.sleep(0.05)
+        connected = client._events_connected
+        await client.close()
+        return connected
+
+    with caplog.at_level(logging.WARNING):
+        connected = asyncio.run(scenario())
+
+    assert not connected
+    assert any("event stream failed" in message for message in caplog.messages)
+
+
+def test_short_ttl_applies_while_stream_is_down():
+    async def scenario():
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            if request.url.path.endswith("/events"):
+                return httpx.Response(503)
+            body = b'{"services": [], "total_count": 0, "query": {}}'
+            return httpx.Response(
+                200, content=body, headers={"content-type": "application/json"}
+            )
+
+        client = _client(handler)
+        key = (None, "agent", None, None, ServiceStatus.HEALTHY)
+        # Fresh by the long TTL, stale by the fallback TTL
+        client._cache[key] = ([], time.monotonic() - 120)
+        await client.discover_services(name="agent")
+        await client.close()
+        return requests
+
+    assert "/api/v1/discover" in asyncio.run(scenario())
+
+
+def test_service_token_is_sent_to_registry_only():
+    async def scenario():
+        tokens = []
+
+        def handler(request):
+            tokens.append((request.url.host, request.headers.get("X-Service-Token")))
+            if request.url.path.endswith("/register"):
+                body = b'{"service_id": "svc-1", "heartbeat_token": "secret"}'
+            else:
+                body = b'{"services": [], "total_count": 0, "query": {}}'
+            return httpx.Response(
+                200, content=body, headers={"content-type": "application/json"}
+            )
+
+        client = _client(handler)
+        await client.register_service(
+            ServiceRegistration(
+                name="agent", service_type=ServiceType.AGENT, host="a", port=1
+            )
+        )
+        await client.discover_services(name="agent", use_cache=False)
+        # call_service sends requests to other services through this client
+        await client._client.get("http://other-service/ping")
+        await client.close()
+        return tokens
+
+    tokens = asyncio.run(scenario())
+
+    assert ("registry", "secret") in tokens
+    assert ("other-service", None) in tokens
+
+
+@pytest.mark.parametrize("status, keeps_msgpack", [(415, False), (422, True)])
+def test_msgpack_rejection_falls_back_to_json(status, keeps_msgpack):
+    async def scenario():
+        def handler(request):
+            if request.headers["content-type"] == "application/msgpack":
+                return httpx.Response(status)
+            body = b'{"services": [], "total_count": 0, "query": {}}'
+            return httpx.Response(
+                200, content=body, headers={"content-type": "application/json"}
+            )
+
+        client = _client(handler)
+        await client.discover_services(name="agent", use_cache=False)
+        await client.close()
+        return client._use_msgpack
+
+    assert asyncio.run(scenario()) is keeps_msgpack
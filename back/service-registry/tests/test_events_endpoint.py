@@ -0,0 +1,67 @@
+"""Tests for the service change event stream."""
+
+import asyncio
+
+import orjson
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("kazoo")
+pytest.importorskip("uuid_utils")
+
+from api import endpoints  # noqa: E402
+from core.service_registry import ServiceRegistry  # noqa: E402
+
+
+class FakeRequest:
+    """Request that disconnects after a number of checks."""
+
+    def __init__(self, checks: int):
+        self._checks = checks
+
+    async def is_disconnected(self) -> bool:
+        self._checks -= 1
+        return self._checks < 0
+
+
+async def _collect(registry, request, publish=()):
+    response = await endpoints.stream_events(request, registry)
+    for service_id, change in publish:
+        registry._publish_event(service_id, change)
+    return [chunk async for chunk in response.body_iterator], response
+
+
+def test_events_are_streamed_as_sse_and_subscriber_removed():
+    registry = ServiceRegistry(zk_client=None)
+
+    chunks, response = asyncio.run(
+        _collect(registry, FakeRequest(2), [("svc-1", "added"), ("svc-1", "removed")])
+    )
+
+    assert response.media_type == "text/event-stream"
+    assert [orjson.loads(chunk[len(b"data: ") : -2]) for chunk in chunks] == [
+        {"type": "service_changed", "service_id": "svc-1", "change": "added"},
+        {"type": "service_changed", "service_id": "svc-1", "change": "removed"},
+    ]
+    assert not registry._event_subscribers
+
+
+def test_idle_stream_sends_keepalive(monkeypatch):
+    monkeypatch.setattr(endpoints.settings, "event_keepalive_interval", 0.01)
+    registry = ServiceRegistry(zk_client=None)
+
+    chunks, _ = asyncio.run(_collect(registry, FakeRequest(1)))
+
+    assert chunks == [b": keepalive\n\n"]
+
+
+def test_slow_subscriber_gets_a_reset_event(monkeypatch):
+    monkeypatch.setattr(endpoints.settings, "event_queue_size", 2)
+    registry = ServiceRegistry(zk_client=None)
+    queue = registry.subscribe_events()
+
+    for i in range(3):
+        registry._publish_event(f"svc-{i}", "added")
+
+    assert queue.qsize() == 1
+    assert queue.get_nowait()["type"] == "services_reset"
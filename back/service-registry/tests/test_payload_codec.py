@@ -0,0 +1,53 @@
+"""Tests for the znode payload codecs."""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("kazoo")
+ormsgpack = pytest.importorskip("ormsgpack")
+
+from core.zookeeper_client import (  # noqa: E402
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    MSGPACK_PAYLOAD_VERSION,
+    ZookeeperClient,
+    decode_payload,
+    encode_payload,
+)
+
+DATA = {"service_id": "svc-1", "port": 8000, "tags": ["a", "b"]}
+
+
+def test_msgpack_payload_is_version_prefixed():
+    payload = encode_payload(DATA, CODEC_MSGPACK)
+
+    assert payload[:1] == MSGPACK_PAYLOAD_VERSION
+    assert ormsgpack.unpackb(payload[1:]) == DATA
+    assert decode_payload(payload) == DATA
+
+
+def test_json_payload_is_still_readable():
+    payload = encode_payload(DATA, CODEC_JSON)
+
+    assert payload[:1] == b"{"
+    assert decode_payload(payload) == DATA
+
+
+def test_codecs_encode_datetimes_alike():
+    data = {"at": datetime(2026, 1, 2, 3, 4, 5, 6)}
+
+    assert decode_payload(encode_payload(data, CODEC_MSGPACK)) == decode_payload(
+        encode_payload(data, CODEC_JSON)
+    )
+
+
+@pytest.mark.parametrize("codec", [CODEC_MSGPACK, CODEC_JSON])
+@pytest.mark.parametrize("count", [0, 1, 15, 16, 65535, 65536])
+def test_encode_array_splices_encoded_items(codec, count):
+    client = ZookeeperClient("localhost:2181", codec=codec)
+    items = [{"i": i} for i in range(count)]
+
+    payload = client.encode_array([client.encode(item) for item in items])
+
+    assert decode_payload(payload) == items
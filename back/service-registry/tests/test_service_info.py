@@ -0,0 +1,91 @@
+"""Tests for the ServiceInfo model."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from pydantic import ValidationError  # noqa: E402
+
+from models import ServiceInfo, ServiceMetadata, ServiceType  # noqa: E402
+
+
+def _service(**overrides) -> ServiceInfo:
+    fields = dict(
+        service_id="svc-1",
+        name="Tool-Agent",
+        service_type=ServiceType.AGENT,
+        host="localhost",
+        port=8000,
+    )
+    fields.update(overrides)
+    return ServiceInfo(**fields)
+
+
+def test_mark_heartbeat_accepts_timezone_aware_time():
+    service = _service()
+    aware = datetime.now(timezone(timedelta(hours=7)))
+
+    service.mark_heartbeat(aware)
+
+    assert service.last_heartbeat.tzinfo is None
+    assert service.last_heartbeat == aware.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def test_timezone_aware_payload_validates():
+    service = ServiceInfo.model_validate(
+        {
+            "service_id": "svc-1",
+            "name": "tool-agent",
+            "service_type": "agent",
+            "host": "localhost",
+            "port": 8000,
+            "last_heartbeat": "2026-01-01T07:00:00+07:00",
+        }
+    )
+
+    assert service.last_heartbeat == datetime(2026, 1, 1)
+
+
+def test_derived_fields_follow_assignment():
+    service = _service()
+
+    service.port = 9000
+
+    assert service.base_url == "http://localhost:9000"
+    assert service.health_url == "http://localhost:9000/health"
+    assert service.name_lower == "tool-agent"
+
+
+def test_metadata_cannot_change_in_place():
+    service = _service(metadata={"tags": ["search"]})
+
+    with pytest.raises((AttributeError, ValidationError)):
+        service.metadata.tags.append("chat")
+    with pytest.raises(ValidationError):
+        service.metadata.tags = ("chat",)
+    with pytest.raises(ValidationError):
+        service.health_check.endpoint = "/ready"
+
+    assert service.tag_set == frozenset({"search"})
+
+
+def test_replaced_metadata_refreshes_lookup_sets():
+    service = _service()
+    encoder = lambda data: repr(data["metadata"]["tags"]).encode()  # noqa: E731
+
+    service.metadata = ServiceMetadata(tags=["search"], capabilities=["rag"])
+
+    assert service.tag_set == frozenset({"search"})
+    assert service.capability_set == frozenset({"rag"})
+    assert service.encode(encoder) == b"['search']"
+
+
+def test_encode_reflects_heartbeat():
+    service = _service()
+    encoder = lambda data: data["last_heartbeat"].encode()  # noqa: E731
+
+    service.mark_heartbeat(datetime(2026, 1, 1, 12))
+
+    assert service.encode(encoder) == b"2026-01-01T12:00:00"
@@ -0,0 +1,49 @@
+"""
+Embedding endpoints
+
+Lets other replicas share this process's model instead of loading their own
+copy (see EMBEDDING_SERVER_URL).
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
+
+from models.api import EmbedInfoResponse, EmbedRequest
+from services.embedding_service import embedding_service
+from core.logging import get_logger
+
+router = APIRouter(prefix="/embed", tags=["embed"])
+logger = get_logger(__name__)
+
+
+def _require_local_model():
+    # A replica that itself delegates to a server must not be chained to
+    if not embedding_service.is_local:
+        raise HTTPException(status_code=503, detail="Embedding model not loaded")
+
+
+@router.get("", response_model=EmbedInfoResponse)
+async def embed_info():
+    """Describe the model served by this replica"""
+    _require_local_model()
+    return EmbedInfoResponse(
+        model=embedding_service.model_name, dimension=embedding_service.dimension
+    )
+
+
+@router.post("/batch", response_class=ORJSONResponse)
+def embed_batch(request: EmbedRequest) -> ORJSONResponse:
+    """Embed a batch of texts with one model call
+
+    A plain def so FastAPI runs the model call on its threadpool instead of
+    the event loop.
+    """
+    _require_local_model()
+    try:
+        embeddings = embedding_service.encode_batch(request.texts)
+        # ORJSONResponse serializes the ndarray natively
+        return ORJSONResponse({"embeddings": embeddings})
+
+    except Exception as e:
+        logger.error(f"❌ Embedding batch failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -4,6 +4,7 @@ Search endpoints
 
 import time
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 
 from models.cdc import SearchQuery
 from models.api import SearchResponse
@@ -15,14 +16,18 @@ router = APIRouter(prefix="/search", tags=["search"])
 logger = get_logger(__name__)
 
 
-@router.post("/messages", response_model=SearchResponse)
-async def search_messages(query: SearchQuery) -> SearchResponse:
+@router.post(
+    "/messages",
+    response_class=ORJSONResponse,
+    responses={200: {"model": SearchResponse}},
+)
+async def search_messages(query: SearchQuery) -> ORJSONResponse:
     """Search messages using semantic similarity"""
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     try:
         # Generate query embedding
-        query_embedding = embedding_service.encode(query.query)
+        query_embedding = await embedding_service.encode_async(query.query)
 
         # Search ChromaDB
         results = await chromadb_service.search_similar(
@@ -32,13 +37,16 @@ async def search_messages(query: SearchQuery) -> SearchResponse:
             limit=query.limit,
         )
 
-        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000  # ms
 
-        return SearchResponse(
-            query=query.query,
-            results=results,
-            total_results=len(results),
-            processing_time_ms=processing_time,
+        # Results are already plain dicts; skip response model validation
+        return ORJSONResponse(
+            {
+                "query": query.query,
+                "results": results,
+                "total_results": len(results),
+                "processing_time_ms": processing_time,
+            }
         )
 
     except Exception as e:
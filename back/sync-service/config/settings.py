@@ -27,6 +27,9 @@ class Settings(BaseSettings):
     kafka_auto_offset_reset: str = Field(
         default="latest", env="KAFKA_AUTO_OFFSET_RESET"
     )
+    # Messages fetched per consume() call, and how long to wait for them
+    kafka_batch_size: int = Field(default=256, env="KAFKA_BATCH_SIZE")
+    kafka_poll_timeout: float = Field(default=0.5, env="KAFKA_POLL_TIMEOUT")
 
     # ChromaDB
     chromadb_host: str = Field(default="chromadb", env="CHROMADB_HOST")
@@ -34,11 +37,34 @@ class Settings(BaseSettings):
     chromadb_collection_name: str = Field(
         default="chat_messages", env="CHROMADB_COLLECTION_NAME"
     )
+    # Upserts are buffered and written in batches of up to this many messages
+    chromadb_batch_size: int = Field(default=128, env="CHROMADB_BATCH_SIZE")
+    # ...or after this long, whichever comes first
+    chromadb_flush_interval_ms: int = Field(
+        default=200, env="CHROMADB_FLUSH_INTERVAL_MS"
+    )
+    # Pending upserts before submitters wait for a flush
+    chromadb_batch_queue_size: int = Field(
+        default=1024, env="CHROMADB_BATCH_QUEUE_SIZE"
+    )
+    # Batches written to ChromaDB at the same time
+    max_concurrent_upserts: int = Field(default=8, env="MAX_CONCURRENT_UPSERTS")
 
     # Embedding
     embedding_model_name: str = Field(
         default="all-MiniLM-L6-v2", env="EMBEDDING_MODEL_NAME"
     )
+    embedding_batch_size: int = Field(default=1024, env="EMBEDDING_BATCH_SIZE")
+    # "cuda", "cpu", or "auto" to use a GPU when one is available
+    embedding_device: str = Field(default="auto", env="SYNC_SERVICE_DEVICE")
+    # Embeddings kept for repeated message contents
+    embedding_cache_size: int = Field(default=10000, env="EMBEDDING_CACHE_SIZE")
+    # Base URL of a replica that owns the model (its /embed endpoints); when
+    # empty the model is loaded in-process
+    embedding_server_url: str = Field(default="", env="EMBEDDING_SERVER_URL")
+    embedding_server_timeout: float = Field(
+        default=30.0, env="EMBEDDING_SERVER_TIMEOUT"
+    )
 
     # CDC Topics
     cdc_topics: List[str] = [
@@ -16,7 +16,7 @@ from services.chromadb_service import chromadb_service
 from services.embedding_service import embedding_service
 from services.kafka_service import kafka_service
 from processors.cdc_processor import CDCProcessor
-from api import health, search, stats
+from api import embed, health, search, stats
 
 # Setup logging
 setup_logging()
@@ -42,7 +42,7 @@ async def lifespan(app: FastAPI):
     success &= await chromadb_service.initialize()
 
     logger.info("Initializing Kafka service...")
-    success &= await kafka_service.initialize(CDCProcessor.process_cdc_event)
+    success &= await kafka_service.initialize(CDCProcessor.process_cdc_batch)
 
     if success:
         # Start CDC consumer in background
@@ -57,6 +57,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down services...")
     await kafka_service.stop_consuming()
+    await chromadb_service.close()
     logger.info("👋 Shutdown complete")
 
 
@@ -81,6 +82,7 @@ app.add_middleware(
 app.include_router(health.router)
 app.include_router(search.router)
 app.include_router(stats.router)
+app.include_router(embed.router)
 
 
 @app.get("/")
@@ -4,7 +4,7 @@ API response models
 
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class HealthResponse(BaseModel):
@@ -44,3 +44,16 @@ class SearchResponse(BaseModel):
     results: List[SearchResult]
     total_results: int
     processing_time_ms: float
+
+
+class EmbedInfoResponse(BaseModel):
+    """Model served by the embedding endpoints"""
+
+    model: str
+    dimension: int
+
+
+class EmbedRequest(BaseModel):
+    """Batch of texts to embed"""
+
+    texts: List[str] = Field(..., min_length=1)
@@ -3,7 +3,6 @@ CDC data models
 """
 
 from typing import Dict, Any, Optional
-from datetime import datetime
 from pydantic import BaseModel, Field
 
 
@@ -23,17 +22,6 @@ class CDCMessage(BaseModel):
     payload: CDCPayload
 
 
-class MessageData(BaseModel):
-    """Message data for ChromaDB"""
-
-    message_id: str
-    conversation_id: str
-    sender_id: str
-    content: str
-    sent_at: datetime
-    operation: str = Field(description="CDC operation: c, u, d")
-
-
 class SearchQuery(BaseModel):
     """Search query model"""
 
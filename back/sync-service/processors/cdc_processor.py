@@ -2,7 +2,7 @@
 Main CDC event processor
 """
 
-from typing import Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 
 from core.logging import get_logger
 from processors.message_processor import MessageProcessor
@@ -10,6 +10,38 @@ from processors.message_processor import MessageProcessor
 logger = get_logger(__name__)
 
 
+async def _log_conversation(cdc_data: Dict[str, Any]) -> bool:
+    logger.info(
+        f"📝 Conversation CDC event: {cdc_data.get('payload', {}).get('op', 'unknown')}"
+    )
+    return True
+
+
+async def _log_conversation_member(cdc_data: Dict[str, Any]) -> bool:
+    logger.info(
+        f"👥 Conversation member CDC event: {cdc_data.get('payload', {}).get('op', 'unknown')}"
+    )
+    return True
+
+
+async def _log_message_delivery(cdc_data: Dict[str, Any]) -> bool:
+    logger.info(
+        f"📬 Message delivery CDC event: {cdc_data.get('payload', {}).get('op', 'unknown')}"
+    )
+    return True
+
+
+MESSAGES_TOPIC = "chat.cdc.messages"
+
+# Topic -> handler, resolved once at import instead of per event
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[bool]]] = {
+    MESSAGES_TOPIC: MessageProcessor.process_cdc_event,
+    "chat.cdc.conversations": _log_conversation,
+    "chat.cdc.conversation_members": _log_conversation_member,
+    "chat.cdc.message_deliveries": _log_message_delivery,
+}
+
+
 class CDCProcessor:
     """Routes CDC events to appropriate processors"""
 
@@ -17,27 +49,32 @@ class CDCProcessor:
     async def process_cdc_event(topic: str, cdc_data: Dict[str, Any]) -> bool:
         """Route CDC events to appropriate processors"""
         try:
-            if topic == "chat.cdc.messages":
-                return await MessageProcessor.process_cdc_event(cdc_data)
-            elif topic == "chat.cdc.conversations":
-                logger.info(
-                    f"📝 Conversation CDC event: {cdc_data.get('payload', {}).get('op', 'unknown')}"
-                )
-                return True
-            elif topic == "chat.cdc.conversation_members":
-                logger.info(
-                    f"👥 Conversation member CDC event: {cdc_data.get('payload', {}).get('op', 'unknown')}"
-                )
-                return True
-            elif topic == "chat.cdc.message_deliveries":
-                logger.info(
-                    f"📬 Message delivery CDC event: {cdc_data.get('payload', {}).get('op', 'unknown')}"
-                )
-                return True
-            else:
+            handler = _HANDLERS.get(topic)
+            if handler is None:
                 logger.warning(f"Unknown CDC topic: {topic}")
                 return False
+            return await handler(cdc_data)
 
         except Exception as e:
             logger.error(f"❌ Error processing CDC event from {topic}: {e}")
             return False
+
+    @staticmethod
+    async def process_cdc_batch(events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Route a batch of CDC events, processing message events together
+
+        Raises if the message events could not be stored.
+        """
+        message_events = []
+        for topic, cdc_data in events:
+            if topic == MESSAGES_TOPIC:
+                message_events.append(cdc_data)
+            else:
+                await CDCProcessor.process_cdc_event(topic, cdc_data)
+
+        if message_events:
+            try:
+                await MessageProcessor.process_cdc_events(message_events)
+            except Exception as e:
+                logger.error(f"❌ Error processing message CDC batch: {e}")
+                raise
@@ -2,16 +2,18 @@
 Message CDC processor
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from core.logging import get_logger
-from models.cdc import MessageData
-from services.chromadb_service import chromadb_service
+from services.chromadb_service import chromadb_service, sent_at_iso
 from services.embedding_service import embedding_service
 
 logger = get_logger(__name__)
 
+# (message_id, content, metadata) as handed to the batching upserter
+MessageRow = Tuple[str, str, Dict[str, Any]]
+
 
 class MessageProcessor:
     """Processes CDC events for messages table"""
@@ -36,8 +38,73 @@ class MessageProcessor:
             return False
 
     @staticmethod
-    async def _handle_upsert(payload: Dict[str, Any], operation: str) -> bool:
-        """Handle create/update operations"""
+    async def process_cdc_events(events: List[Dict[str, Any]]) -> None:
+        """Process a batch of message CDC events in order
+
+        Consecutive upserts are embedded with a single model call. A delete
+        submits the upserts gathered before it and waits until they are
+        stored, so none of them can be written after it.
+
+        Malformed events are logged and skipped. A failed embedding or write
+        raises, so the batch is not acknowledged and gets consumed again.
+        """
+        pending: List[MessageRow] = []
+        for cdc_data in events:
+            try:
+                payload = cdc_data.get("payload", {})
+                operation = payload.get("op")
+
+                if operation in ["c", "u"]:
+                    row = MessageProcessor._parse_row(payload, operation)
+                    if row:
+                        pending.append(row)
+                    continue
+                if operation != "d":
+                    logger.warning(f"Unknown operation: {operation}")
+                    continue
+                message_id = payload.get("before", {}).get("message_id")
+
+            except Exception as e:
+                logger.error(f"❌ Error processing message CDC: {e}")
+                continue
+
+            if not message_id:
+                logger.warning("Missing message_id in delete payload")
+                continue
+
+            await MessageProcessor._submit_upserts(pending)
+            pending = []
+            if not await chromadb_service.upserter.delete(message_id):
+                raise RuntimeError(f"Failed to delete message {message_id}")
+            logger.info(f"✅ Deleted message: {message_id}")
+
+        await MessageProcessor._submit_upserts(pending)
+
+        # Offsets are committed after this returns, so wait for the writes
+        await chromadb_service.upserter.flush()
+
+    @staticmethod
+    async def _submit_upserts(rows: List[MessageRow]) -> None:
+        """Embed messages in one batch and queue them for ChromaDB"""
+        if not rows:
+            return
+
+        embeddings = await embedding_service.encode_batch_async(
+            [row[1] for row in rows]
+        )
+        for (message_id, content, metadata), embedding in zip(rows, embeddings):
+            await chromadb_service.upserter.submit(
+                message_id, content, metadata, embedding
+            )
+            logger.info(f"✅ Queued message {metadata['operation']}: {message_id}")
+
+    @staticmethod
+    def _parse_row(payload: Dict[str, Any], operation: str) -> Optional[MessageRow]:
+        """Read the fields of a create/update payload straight off its after dict
+
+        The metadata dict is the one stored in ChromaDB, minus indexed_at_ns
+        which the upserter adds per batch.
+        """
         after = payload.get("after", {})
 
         message_id = after.get("message_id")
@@ -48,37 +115,49 @@ class MessageProcessor:
 
         if not all([message_id, content, conversation_id, sender_id, sent_at_str]):
             logger.warning("Missing required fields in CDC payload")
-            return False
+            return None
+
+        # Keep PostgreSQL's microsecond timestamp as-is
+        if isinstance(sent_at_str, int):
+            sent_at = sent_at_str
+        else:
+            # Handle ISO format string
+            sent_at = int(
+                datetime.fromisoformat(sent_at_str.replace("Z", "+00:00")).timestamp()
+                * 1_000_000
+            )
 
+        return (
+            message_id,
+            content,
+            {
+                "conversation_id": conversation_id,
+                "sender_id": sender_id,
+                "sent_at": sent_at_iso(sent_at),
+                "sent_at_us": sent_at,
+                "operation": operation,
+            },
+        )
+
+    @staticmethod
+    async def _handle_upsert(payload: Dict[str, Any], operation: str) -> bool:
+        """Handle create/update operations"""
         try:
-            # Parse timestamp - handle microsecond timestamp from PostgreSQL
-            if isinstance(sent_at_str, int):
-                # Convert microseconds to datetime
-                sent_at = datetime.fromtimestamp(sent_at_str / 1_000_000)
-            else:
-                # Handle ISO format string
-                sent_at = datetime.fromisoformat(sent_at_str.replace("Z", "+00:00"))
-
-            # Create message data
-            message_data = MessageData(
-                message_id=message_id,
-                conversation_id=conversation_id,
-                sender_id=sender_id,
-                content=content,
-                sent_at=sent_at,
-                operation=operation,
-            )
+            row = MessageProcessor._parse_row(payload, operation)
+            if row is None:
+                return False
+            message_id, content, metadata = row
 
             # Generate embedding
-            embedding = embedding_service.encode(content)
-
-            # Store in ChromaDB
-            success = await chromadb_service.upsert_message(message_data, embedding)
+            embedding = (await embedding_service.encode_batch_async([content]))[0]
 
-            if success:
-                logger.info(f"✅ Processed message {operation}: {message_id}")
+            # Store in ChromaDB with the next batch
+            await chromadb_service.upserter.submit(
+                message_id, content, metadata, embedding
+            )
 
-            return success
+            logger.info(f"✅ Queued message {operation}: {message_id}")
+            return True
 
         except Exception as e:
             logger.error(f"❌ Error handling upsert: {e}")
@@ -95,7 +174,8 @@ class MessageProcessor:
             return False
 
         try:
-            success = await chromadb_service.delete_message(message_id)
+            # Queued upserts of this message must not land after the delete
+            success = await chromadb_service.upserter.delete(message_id)
 
             if success:
                 logger.info(f"✅ Deleted message: {message_id}")
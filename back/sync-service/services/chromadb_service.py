@@ -2,46 +2,224 @@
 ChromaDB service for vector database operations
 """
 
+import asyncio
+import time
 import chromadb
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import numpy as np
+from typing import List, Optional, Dict, Any, Set, Tuple
+from datetime import datetime, timezone
 
 from core.logging import get_logger
 from config.settings import settings
-from models.cdc import MessageData
-from models.api import SearchResult
 
 logger = get_logger(__name__)
 
+COLLECTION_METADATA = {
+    "description": "Chat messages with semantic embeddings",
+    "schema_version": "1",
+}
+
+
+def sent_at_iso(sent_at_us: int) -> str:
+    """Format a microsecond timestamp as the ISO sent_at string
+
+    sent_at is kept next to sent_at_us for readers such as message-agent.
+    """
+    return datetime.fromtimestamp(sent_at_us / 1_000_000, tz=timezone.utc).isoformat()
+
+
+class BatchingUpserter:
+    """Buffers message upserts and writes them to ChromaDB in batches"""
+
+    def __init__(self, service: "ChromaDBService"):
+        self.service = service
+        self.batch_size = settings.chromadb_batch_size
+        self.flush_interval = settings.chromadb_flush_interval_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=settings.chromadb_batch_queue_size
+        )
+        self._task: Optional[asyncio.Task] = None
+
+        # Batches written concurrently, bounded by the semaphore
+        self._sem = asyncio.Semaphore(settings.max_concurrent_upserts)
+        self._in_flight: Set[asyncio.Task] = set()
+
+        # Batches that failed since the last flush() barrier
+        self._failed_batches = 0
+
+    def start(self):
+        """Start the background flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush pending upserts and stop the background task"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        if self._in_flight:
+            # Failures are logged by _flush; nothing is waiting on them here
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        self._task = None
+
+    async def submit(
+        self,
+        message_id: str,
+        content: str,
+        metadata: Dict[str, Any],
+        embedding: np.ndarray,
+    ):
+        """Queue a message for the next batch, waiting only if the queue is full
+
+        metadata is taken over by the upserter, which stamps indexed_at_ns.
+        """
+        await self._queue.put((message_id, content, metadata, embedding))
+
+    async def flush(self):
+        """Write everything submitted so far and wait until it is stored
+
+        Raises RuntimeError if any batch written since the previous flush()
+        failed, so the caller can retry its messages.
+        """
+        if self._task is None:
+            return
+        barrier = asyncio.get_running_loop().create_future()
+        await self._queue.put(barrier)
+        await barrier
+
+    async def delete(self, message_id: str) -> bool:
+        """Delete a message once every upsert submitted before it is stored
+
+        Without the barrier a queued upsert of the same message could be
+        written after the delete and bring it back.
+        """
+        await self.flush()
+        return await self.service.delete_message(message_id)
+
+    async def _run(self):
+        """Collect up to batch_size items or flush_interval worth, then flush"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, asyncio.Future):
+                await self._settle(item)
+                continue
+
+            batch = [item]
+            barrier = None
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                if isinstance(item, asyncio.Future):
+                    barrier = item
+                    break
+                batch.append(item)
+
+            # Wait for a free slot, then write without blocking collection
+            await self._sem.acquire()
+            task = asyncio.create_task(self._flush(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._on_flush_done)
+
+            if barrier is not None:
+                await self._settle(barrier)
+
+    async def _settle(self, barrier: asyncio.Future):
+        """Resolve a flush() barrier once every started write has finished"""
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        failed, self._failed_batches = self._failed_batches, 0
+        if barrier.done():
+            return
+        if failed:
+            barrier.set_exception(
+                RuntimeError(f"{failed} upsert batch(es) failed since last flush")
+            )
+        else:
+            barrier.set_result(None)
+
+    def _on_flush_done(self, task: asyncio.Task):
+        self._in_flight.discard(task)
+        self._sem.release()
+        if not task.cancelled() and task.exception() is not None:
+            self._failed_batches += 1
+
+    async def _flush(self, batch: List[Tuple[str, str, Dict[str, Any], np.ndarray]]):
+        """Write a batch with a single collection.upsert call"""
+        # Chroma rejects duplicate IDs within one call; the latest change wins
+        latest = {item[0]: item for item in batch}
+
+        # One indexing timestamp for the whole batch
+        indexed_at_ns = time.time_ns()
+
+        # Sorted IDs keep concurrent batches on contiguous key ranges
+        ids, embeddings, documents, metadatas = [], [], [], []
+        for message_id in sorted(latest):
+            _, content, metadata, embedding = latest[message_id]
+            metadata["indexed_at_ns"] = indexed_at_ns
+            ids.append(message_id)
+            embeddings.append(embedding)
+            documents.append(content)
+            metadatas.append(metadata)
+
+        try:
+            await self.service.collection.upsert(
+                ids=ids,
+                # One bulk conversion instead of a tolist() per row
+                embeddings=np.vstack(embeddings).tolist(),
+                documents=documents,
+                metadatas=metadatas,
+            )
+            logger.debug(f"✅ Upserted batch of {len(ids)} messages")
+
+        except Exception as e:
+            logger.error(f"❌ Failed to upsert batch of {len(ids)} messages: {e}")
+            raise
+
 
 class ChromaDBService:
     """ChromaDB service for managing chat message embeddings"""
 
     def __init__(self):
-        self.client: Optional[chromadb.Client] = None
+        self.client: Optional[chromadb.AsyncClientAPI] = None
         self.collection = None
         self.host = settings.chromadb_host
         self.port = settings.chromadb_port
         self.collection_name = settings.chromadb_collection_name
+        self.upserter = BatchingUpserter(self)
 
     async def initialize(self) -> bool:
         """Initialize ChromaDB client and collection"""
         try:
-            self.client = chromadb.HttpClient(host=self.host, port=self.port)
+            self.client = await chromadb.AsyncHttpClient(host=self.host, port=self.port)
 
             # Test connection
-            heartbeat = self.client.heartbeat()
+            heartbeat = await self.client.heartbeat()
             logger.info(f"ChromaDB heartbeat: {heartbeat}")
 
             # Create or get collection
-            self.collection = self.client.get_or_create_collection(
+            self.collection = await self.client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={
-                    "description": "Chat messages with semantic embeddings",
-                    "created_at": datetime.now().isoformat(),
-                },
+                # Static so reopening an existing collection changes nothing
+                metadata=COLLECTION_METADATA,
             )
 
+            self.upserter.start()
+
             logger.info(f"✅ ChromaDB initialized: {self.host}:{self.port}")
             return True
 
@@ -49,35 +227,9 @@ class ChromaDBService:
             logger.error(f"❌ ChromaDB initialization failed: {e}")
             return False
 
-    async def upsert_message(
-        self, message: MessageData, embedding: List[float]
-    ) -> bool:
-        """Insert or update message with embedding"""
-        if not self.collection:
-            raise RuntimeError("ChromaDB not initialized")
-
-        try:
-            metadata = {
-                "conversation_id": message.conversation_id,
-                "sender_id": message.sender_id,
-                "sent_at": message.sent_at.isoformat(),
-                "operation": message.operation,
-                "indexed_at": datetime.now().isoformat(),
-            }
-
-            self.collection.upsert(
-                ids=[message.message_id],
-                embeddings=[embedding],
-                documents=[message.content],
-                metadatas=[metadata],
-            )
-
-            logger.debug(f"✅ Upserted message: {message.message_id}")
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ Failed to upsert message {message.message_id}: {e}")
-            return False
+    async def close(self):
+        """Flush buffered upserts"""
+        await self.upserter.stop()
 
     async def delete_message(self, message_id: str) -> bool:
         """Delete message from ChromaDB"""
@@ -85,7 +237,7 @@ class ChromaDBService:
             raise RuntimeError("ChromaDB not initialized")
 
         try:
-            self.collection.delete(ids=[message_id])
+            await self.collection.delete(ids=[message_id])
             logger.debug(f"✅ Deleted message: {message_id}")
             return True
 
@@ -99,8 +251,12 @@ class ChromaDBService:
         conversation_id: Optional[str] = None,
         sender_id: Optional[str] = None,
         limit: int = 10,
-    ) -> List[SearchResult]:
-        """Search for similar messages"""
+    ) -> List[Dict[str, Any]]:
+        """Search for similar messages
+
+        Results are plain dicts shaped like SearchResult, ready for direct
+        JSON encoding.
+        """
         if not self.collection:
             raise RuntimeError("ChromaDB not initialized")
 
@@ -113,7 +269,7 @@ class ChromaDBService:
                 where_clause["sender_id"] = sender_id
 
             # Perform search
-            results = self.collection.query(
+            results = await self.collection.query(
                 query_embeddings=[query_embedding],
                 n_results=limit,
                 where=where_clause if where_clause else None,
@@ -131,15 +287,25 @@ class ChromaDBService:
 
                     similarity_score = max(0, 1 - distance)
 
-                    search_result = SearchResult(
-                        message_id=message_id,
-                        conversation_id=metadata["conversation_id"],
-                        sender_id=metadata["sender_id"],
-                        content=content,
-                        sent_at=datetime.fromisoformat(metadata["sent_at"]),
-                        similarity_score=similarity_score,
+                    sent_at_us = metadata.get("sent_at_us")
+                    if sent_at_us is not None:
+                        sent_at = datetime.fromtimestamp(
+                            sent_at_us / 1_000_000, tz=timezone.utc
+                        )
+                    else:
+                        # Documents indexed before integer timestamps
+                        sent_at = metadata["sent_at"]
+
+                    search_results.append(
+                        {
+                            "message_id": message_id,
+                            "conversation_id": metadata["conversation_id"],
+                            "sender_id": metadata["sender_id"],
+                            "content": content,
+                            "sent_at": sent_at,
+                            "similarity_score": similarity_score,
+                        }
                     )
-                    search_results.append(search_result)
 
             return search_results
 
@@ -153,7 +319,7 @@ class ChromaDBService:
             raise RuntimeError("ChromaDB not initialized")
 
         try:
-            count = self.collection.count()
+            count = await self.collection.count()
             return {
                 "total_documents": count,
                 "collection_name": self.collection_name,
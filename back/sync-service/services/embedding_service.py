@@ -2,7 +2,16 @@
 Embedding service for text vectorization
 """
 
-from typing import List
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import orjson
+import requests
+import torch
 from sentence_transformers import SentenceTransformer
 
 from core.logging import get_logger
@@ -10,6 +19,31 @@ from config.settings import settings
 
 logger = get_logger(__name__)
 
+# Texts this short once stripped ("ok", "👍", "") share one exact embedding
+SHORT_TEXT_MAX_CHARS = 3
+MAX_SHORT_EMBEDDINGS = 4096
+
+
+class CompressedEmbedding(NamedTuple):
+    """Embedding quantized to 8 bits per dimension"""
+
+    codes: np.ndarray  # uint8
+    scale: float
+    offset: float
+
+
+def quantize8(vec: np.ndarray) -> CompressedEmbedding:
+    """Quantize a vector to uint8 codes with a per-vector scale and offset"""
+    offset = float(vec.min())
+    scale = float(vec.max() - offset) / 255 or 1.0
+    codes = np.rint((vec - offset) / scale).astype(np.uint8)
+    return CompressedEmbedding(codes, scale, offset)
+
+
+def dequantize8(compressed: CompressedEmbedding) -> np.ndarray:
+    """Reconstruct a float32 vector from its quantized form"""
+    return compressed.codes.astype(np.float32) * compressed.scale + compressed.offset
+
 
 class EmbeddingService:
     """Service for generating text embeddings"""
@@ -17,44 +51,195 @@ class EmbeddingService:
     def __init__(self):
         self.model: SentenceTransformer = None
         self.model_name = settings.embedding_model_name
+        self.dimension: Optional[int] = None
+
+        # Pooled connection to the embedding server when the model is remote
+        self._remote: Optional[requests.Session] = None
+
+        # Content-addressed LRU of quantized embeddings, keyed by
+        # hash(model, text)
+        self._cache: "OrderedDict[bytes, CompressedEmbedding]" = OrderedDict()
+        self._cache_size = settings.embedding_cache_size
+        self._cache_hits = 0
+        self._cache_lookups = 0
+
+        # encode_batch runs on worker threads; guards the cache and table
+        self._cache_lock = threading.Lock()
+
+        # Stripped short text -> float32 embedding, filled lazily
+        self._short: Dict[str, np.ndarray] = {}
 
     async def initialize(self) -> bool:
         """Initialize embedding model"""
+        if settings.embedding_server_url:
+            return self._connect_remote()
+
         try:
-            self.model = SentenceTransformer(self.model_name)
-            logger.info(f"✅ Embedding model loaded: {self.model_name}")
+            device = settings.embedding_device
+            if device == "auto":
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+
+            self.model = SentenceTransformer(self.model_name, device=device)
+            if device.startswith("cuda"):
+                # fp16 weights and TF32 matmuls; embedding quality is unaffected
+                self.model.half()
+                torch.backends.cuda.matmul.allow_tf32 = True
+            self.dimension = self.model.get_sentence_embedding_dimension()
+
+            logger.info(f"✅ Embedding model loaded: {self.model_name} on {device}")
             return True
 
         except Exception as e:
             logger.error(f"❌ Failed to load embedding model: {e}")
             return False
 
-    def encode(self, text: str) -> List[float]:
-        """Generate embedding for text"""
-        if not self.model:
-            raise RuntimeError("Embedding model not initialized")
-
+    def _connect_remote(self) -> bool:
+        """Use the model owned by the embedding server instead of a local copy"""
+        url = settings.embedding_server_url.rstrip("/")
         try:
-            embedding = self.model.encode([text])[0]
-            return embedding.tolist()
+            session = requests.Session()
+            response = session.get(
+                f"{url}/embed", timeout=settings.embedding_server_timeout
+            )
+            response.raise_for_status()
+            info = orjson.loads(response.content)
+
+            # Cache keys must name the model that actually produced the vectors
+            self.model_name = info["model"]
+            self.dimension = info["dimension"]
+            self._remote = session
+
+            logger.info(f"✅ Using embedding server: {url} ({self.model_name})")
+            return True
 
         except Exception as e:
-            logger.error(f"❌ Failed to generate embedding: {e}")
-            raise
+            logger.error(f"❌ Failed to reach embedding server {url}: {e}")
+            return False
+
+    @property
+    def is_local(self) -> bool:
+        """Whether this process owns the model"""
+        return self.model is not None
 
-    def encode_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
-        if not self.model:
+    def encode(self, text: str) -> List[float]:
+        """Generate embedding for text"""
+        return self.encode_batch([text])[0].tolist()
+
+    async def encode_async(self, text: str) -> List[float]:
+        """encode() on a worker thread, keeping the event loop free"""
+        return await asyncio.to_thread(self.encode, text)
+
+    async def encode_batch_async(self, texts: List[str]) -> np.ndarray:
+        """encode_batch() on a worker thread, keeping the event loop free
+
+        Both the local model and the embedding server block for the whole
+        call.
+        """
+        return await asyncio.to_thread(self.encode_batch, texts)
+
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts as an [N, d] float32 array
+
+        Texts seen before are served from the cache, and short texts from
+        the short-text table; only the rest go through the model. Freshly
+        encoded vectors are returned at full precision; only the cached copy
+        is 8-bit quantized, so a cache hit is within half a quantization step
+        per dimension of the original.
+        """
+        if self.model is None and self._remote is None:
             raise RuntimeError("Embedding model not initialized")
 
         try:
-            embeddings = self.model.encode(texts)
-            return [emb.tolist() for emb in embeddings]
+            results = np.empty((len(texts), self.dimension), dtype=np.float32)
+
+            # Duplicates within the batch are encoded once. Short texts are
+            # keyed by their stripped str, everything else by a bytes hash.
+            misses: Dict[object, List[int]] = {}
+            miss_texts: Dict[object, str] = {}
+            with self._cache_lock:
+                for i, text in enumerate(texts):
+                    stripped = text.strip()
+                    if len(stripped) <= SHORT_TEXT_MAX_CHARS:
+                        short = self._short.get(stripped)
+                        if short is not None:
+                            results[i] = short
+                            continue
+                        key = stripped
+                        miss_texts[key] = stripped
+                    else:
+                        key = self._cache_key(text)
+                        cached = self._cache.get(key)
+                        if cached is not None:
+                            self._cache.move_to_end(key)
+                            results[i] = dequantize8(cached)
+                            continue
+                        miss_texts.setdefault(key, text)
+                    misses.setdefault(key, []).append(i)
+
+                self._cache_lookups += len(texts)
+                self._cache_hits += len(texts) - sum(
+                    len(idx) for idx in misses.values()
+                )
+
+            if misses:
+                miss_keys = list(misses)
+                embeddings = self._encode_uncached(
+                    [miss_texts[key] for key in miss_keys]
+                )
+                with self._cache_lock:
+                    for key, embedding in zip(miss_keys, embeddings):
+                        if isinstance(key, str):
+                            if len(self._short) < MAX_SHORT_EMBEDDINGS:
+                                self._short[key] = embedding
+                        else:
+                            self._remember(key, quantize8(embedding))
+                        results[misses[key]] = embedding
+
+            logger.debug(
+                f"Embedding cache hit rate: {self._cache_hits}/{self._cache_lookups}"
+            )
+            return results
 
         except Exception as e:
             logger.error(f"❌ Failed to generate batch embeddings: {e}")
             raise
 
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        """Run texts through the local model or the embedding server"""
+        if self._remote is not None:
+            response = self._remote.post(
+                f"{settings.embedding_server_url.rstrip('/')}/embed/batch",
+                data=orjson.dumps({"texts": texts}),
+                headers={"Content-Type": "application/json"},
+                timeout=settings.embedding_server_timeout,
+            )
+            response.raise_for_status()
+            return np.asarray(
+                orjson.loads(response.content)["embeddings"], dtype=np.float32
+            )
+
+        # encode() already sorts texts by length so each mini-batch is
+        # padded only to its own longest text, then restores the order
+        with torch.inference_mode():
+            return self.model.encode(
+                texts,
+                batch_size=settings.embedding_batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+
+    def _cache_key(self, text: str) -> bytes:
+        """Content-address a text for the configured model"""
+        return hashlib.blake2b(
+            f"{self.model_name}\0{text}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    def _remember(self, key: bytes, compressed: CompressedEmbedding):
+        """Store an embedding, evicting the least recently used one"""
+        self._cache[key] = compressed
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
 
 # Global service instance
 embedding_service = EmbeddingService()
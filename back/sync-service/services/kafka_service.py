@@ -2,10 +2,11 @@
 Kafka consumer service for CDC events
 """
 
-import json
 import asyncio
-from typing import Optional, Callable
-from confluent_kafka import Consumer, KafkaError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Callable, Tuple
+import orjson
+from confluent_kafka import Consumer, KafkaError, Message, TopicPartition
 
 from core.logging import get_logger
 from config.settings import settings
@@ -21,6 +22,12 @@ class KafkaService:
         self.is_running = False
         self.message_handler: Optional[Callable] = None
 
+        # consume() blocks in librdkafka, so it runs off the event loop on a
+        # single thread that owns all blocking consumer calls
+        self._kafka_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="kafka-poll"
+        )
+
     async def initialize(self, message_handler: Callable) -> bool:
         """Initialize Kafka consumer"""
         try:
@@ -28,7 +35,8 @@ class KafkaService:
                 "bootstrap.servers": settings.kafka_bootstrap_servers,
                 "group.id": settings.kafka_group_id,
                 "auto.offset.reset": settings.kafka_auto_offset_reset,
-                "enable.auto.commit": True,
+                # Offsets are committed once a batch has been processed
+                "enable.auto.commit": False,
                 "session.timeout.ms": 6000,
                 "heartbeat.interval.ms": 1000,
             }
@@ -53,42 +61,83 @@ class KafkaService:
 
         self.is_running = True
         logger.info("🔄 Starting Kafka CDC consumer...")
+        loop = asyncio.get_running_loop()
 
         while self.is_running:
+            msgs: List[Message] = []
             try:
-                msg = self.consumer.poll(timeout=1.0)
-
-                if msg is None:
-                    await asyncio.sleep(0.1)
+                msgs = await loop.run_in_executor(
+                    self._kafka_pool,
+                    lambda: self.consumer.consume(
+                        num_messages=settings.kafka_batch_size,
+                        timeout=settings.kafka_poll_timeout,
+                    ),
+                )
+
+                if not msgs:
                     continue
 
-                if msg.error():
-                    if msg.error().code() == KafkaError._PARTITION_EOF:
+                events = []
+                for msg in msgs:
+                    if msg.error():
+                        if msg.error().code() != KafkaError._PARTITION_EOF:
+                            logger.error(f"❌ Consumer error: {msg.error()}")
                         continue
-                    else:
-                        logger.error(f"❌ Consumer error: {msg.error()}")
+
+                    try:
+                        cdc_data = orjson.loads(msg.value())
+                    except orjson.JSONDecodeError as e:
+                        logger.error(f"❌ Failed to parse CDC message: {e}")
                         continue
 
-                # Process message
-                try:
-                    cdc_data = json.loads(msg.value().decode("utf-8"))
-                    topic = msg.topic()
+                    events.append((msg.topic(), cdc_data))
 
-                    await self.message_handler(topic, cdc_data)
+                # Process the whole batch so embeddings are computed together
+                if events:
+                    await self.message_handler(events)
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ Failed to parse CDC message: {e}")
+                # Only reached when the whole batch was stored
+                self.consumer.commit(asynchronous=True)
 
             except Exception as e:
                 logger.error(f"❌ Error in consumer loop: {e}")
+                if msgs:
+                    await self._rewind(msgs)
                 await asyncio.sleep(5)
 
+    async def _rewind(self, msgs: List[Message]):
+        """Seek back to the start of a failed batch so it is consumed again
+
+        consume() has already moved past the batch, so without this the next
+        call would skip it even though its offsets were never committed.
+        """
+        # Messages of a partition arrive in offset order
+        first_offsets: Dict[Tuple[str, int], int] = {}
+        for msg in msgs:
+            if not msg.error():
+                first_offsets.setdefault((msg.topic(), msg.partition()), msg.offset())
+
+        def seek_all():
+            for (topic, partition), offset in first_offsets.items():
+                self.consumer.seek(TopicPartition(topic, partition, offset))
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._kafka_pool, seek_all)
+            logger.warning(f"↩️ Retrying {len(msgs)} messages from the failed batch")
+        except Exception as e:
+            # A revoked partition restarts from its committed offset anyway
+            logger.error(f"❌ Failed to rewind consumer: {e}")
+
     async def stop_consuming(self):
         """Stop consuming messages"""
         self.is_running = False
         if self.consumer:
-            self.consumer.close()
+            # Queued behind any in-flight consume() on the polling thread
+            await asyncio.get_running_loop().run_in_executor(
+                self._kafka_pool, self.consumer.close
+            )
             logger.info("✅ Kafka consumer stopped")
+        self._kafka_pool.shutdown(wait=False)
 
 
 # Global service instance
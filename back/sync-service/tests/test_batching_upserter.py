@@ -0,0 +1,80 @@
+"""
+Tests for the batching ChromaDB upserter
+"""
+
+import asyncio
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("chromadb")
+pytest.importorskip("pydantic_settings")
+
+from services.chromadb_service import ChromaDBService  # noqa: E402
+
+
+class FakeCollection:
+    """Records the writes made against it, in order"""
+
+    def __init__(self):
+        self.ops = []
+
+    async def upsert(self, ids, embeddings, documents, metadatas):
+        await asyncio.sleep(0.01)
+        self.ops.append(("upsert", list(ids), metadatas))
+
+    async def delete(self, ids):
+        self.ops.append(("delete", list(ids)))
+
+
+def _service() -> ChromaDBService:
+    service = ChromaDBService()
+    service.collection = FakeCollection()
+    return service
+
+
+def _metadata() -> dict:
+    return {"conversation_id": "c", "sender_id": "s", "operation": "c"}
+
+
+def test_flush_writes_one_deduplicated_batch():
+    async def scenario():
+        service = _service()
+        service.upserter.start()
+        await service.upserter.submit("m2", "old", _metadata(), np.zeros(3))
+        await service.upserter.submit("m1", "first", _metadata(), np.zeros(3))
+        await service.upserter.submit("m2", "new", _metadata(), np.ones(3))
+        await service.upserter.flush()
+        await service.upserter.stop()
+        return service.collection.ops
+
+    ops = asyncio.run(scenario())
+
+    assert [op[:2] for op in ops] == [("upsert", ["m1", "m2"])]
+    assert all("indexed_at_ns" in metadata for metadata in ops[0][2])
+
+
+def test_delete_follows_queued_upsert_of_same_id():
+    async def scenario():
+        service = _service()
+        service.upserter.start()
+        await service.upserter.submit("m1", "hello", _metadata(), np.zeros(3))
+        deleted = await service.upserter.delete("m1")
+        await service.upserter.stop()
+        return deleted, service.collection.ops
+
+    deleted, ops = asyncio.run(scenario())
+
+    assert deleted
+    assert [op[:2] for op in ops] == [("upsert", ["m1"]), ("delete", ["m1"])]
+
+
+def test_stop_flushes_pending_upserts():
+    async def scenario():
+        service = _service()
+        service.upserter.start()
+        await service.upserter.submit("m1", "hello", _metadata(), np.zeros(3))
+        await service.upserter.stop()
+        return service.collection.ops
+
+    assert [op[:2] for op in asyncio.run(scenario())] == [("upsert", ["m1"])]
@@ -0,0 +1,75 @@
+"""
+Tests for the embedding cache and short-text table
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("pydantic_settings")
+
+from services.embedding_service import (  # noqa: E402
+    EmbeddingService,
+    dequantize8,
+    quantize8,
+)
+
+DIMENSION = 8
+
+
+def _service():
+    """Service whose model is a deterministic stub counting its calls"""
+    service = EmbeddingService()
+    service.dimension = DIMENSION
+    service._remote = object()
+    calls = []
+
+    def encode_uncached(texts):
+        calls.append(list(texts))
+        rng = np.random.default_rng(sum(map(ord, "".join(texts))))
+        return rng.standard_normal((len(texts), DIMENSION)).astype(np.float32)
+
+    service._encode_uncached = encode_uncached
+    return service, calls
+
+
+def test_quantize8_round_trip_is_close():
+    vec = np.linspace(-1, 1, 384, dtype=np.float32)
+    compressed = quantize8(vec)
+
+    assert compressed.codes.dtype == np.uint8
+    assert np.abs(dequantize8(compressed) - vec).max() <= compressed.scale / 2 + 1e-6
+
+
+def test_miss_is_full_precision_and_hit_is_close():
+    service, calls = _service()
+    text = "a message long enough to be cached"
+
+    miss = np.asarray(service.encode(text), dtype=np.float32)
+    hit = np.asarray(service.encode(text), dtype=np.float32)
+    exact = service._encode_uncached([text])[0]
+
+    assert len(calls) == 2
+    assert np.array_equal(miss, exact)
+    step = (exact.max() - exact.min()) / 255
+    assert np.abs(hit - miss).max() <= step / 2 + 1e-6
+
+
+def test_short_text_hit_matches_miss():
+    service, calls = _service()
+
+    miss = service.encode(" ok ")
+    hit = service.encode("ok")
+
+    assert len(calls) == 1
+    assert hit == miss
+
+
+def test_duplicates_in_batch_are_encoded_once():
+    service, calls = _service()
+
+    embeddings = service.encode_batch(["same text here", "same text here", "hi"])
+
+    assert calls == [["same text here", "hi"]]
+    assert np.array_equal(embeddings[0], embeddings[1])
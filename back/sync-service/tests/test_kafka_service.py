@@ -0,0 +1,136 @@
+"""
+Tests for offset handling in the Kafka consumer loop
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("chromadb")
+pytest.importorskip("confluent_kafka")
+pytest.importorskip("pydantic_settings")
+
+from processors.cdc_processor import MESSAGES_TOPIC, CDCProcessor  # noqa: E402
+from services import kafka_service as kafka_module  # noqa: E402
+from services.chromadb_service import BatchingUpserter, chromadb_service  # noqa: E402
+from services.embedding_service import embedding_service  # noqa: E402
+
+
+class FakeMessage:
+    def __init__(self, partition: int, offset: int, message_id: str):
+        self._partition = partition
+        self._offset = offset
+        self._value = orjson.dumps(
+            {
+                "payload": {
+                    "op": "c",
+                    "after": {
+                        "message_id": message_id,
+                        "content": "hello",
+                        "conversation_id": "c",
+                        "sender_id": "s",
+                        "sent_at": 1_700_000_000_000_000,
+                    },
+                }
+            }
+        )
+
+    def error(self):
+        return None
+
+    def topic(self):
+        return MESSAGES_TOPIC
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def value(self):
+        return self._value
+
+
+class FakeConsumer:
+    """Hands out one batch, then stops the service"""
+
+    def __init__(self, service, msgs):
+        self.service = service
+        self.batches = [msgs]
+        self.commits = 0
+        self.seeks = []
+
+    def consume(self, num_messages, timeout):
+        if not self.batches:
+            self.service.is_running = False
+            return []
+        return self.batches.pop(0)
+
+    def commit(self, asynchronous):
+        self.commits += 1
+
+    def seek(self, partition):
+        self.seeks.append((partition.topic, partition.partition, partition.offset))
+
+
+class FakeCollection:
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    async def upsert(self, ids, embeddings, documents, metadatas):
+        if self.fail:
+            raise ConnectionError("chroma unavailable")
+
+
+def _run(monkeypatch, fail: bool) -> FakeConsumer:
+    async def encode_batch_async(texts):
+        return np.zeros((len(texts), 3), dtype=np.float32)
+
+    async def sleep(delay):
+        service.is_running = False
+
+    monkeypatch.setattr(embedding_service, "encode_batch_async", encode_batch_async)
+    monkeypatch.setattr(chromadb_service, "collection", FakeCollection(fail))
+    monkeypatch.setattr(
+        chromadb_service, "upserter", BatchingUpserter(chromadb_service)
+    )
+    monkeypatch.setattr(
+        kafka_module,
+        "asyncio",
+        SimpleNamespace(get_running_loop=asyncio.get_running_loop, sleep=sleep),
+    )
+
+    service = kafka_module.KafkaService()
+    consumer = FakeConsumer(
+        service,
+        [FakeMessage(0, 41, "m1"), FakeMessage(1, 7, "m2"), FakeMessage(0, 42, "m3")],
+    )
+    service.consumer = consumer
+    service.message_handler = CDCProcessor.process_cdc_batch
+
+    async def scenario():
+        chromadb_service.upserter.start()
+        try:
+            await service.start_consuming()
+        finally:
+            await chromadb_service.upserter.stop()
+
+    asyncio.run(scenario())
+    return consumer
+
+
+def test_batch_is_committed_once_stored(monkeypatch):
+    consumer = _run(monkeypatch, fail=False)
+
+    assert consumer.commits == 1
+    assert consumer.seeks == []
+
+
+def test_failed_upsert_is_not_committed_and_rewinds(monkeypatch):
+    consumer = _run(monkeypatch, fail=True)
+
+    assert consumer.commits == 0
+    assert sorted(consumer.seeks) == [(MESSAGES_TOPIC, 0, 41), (MESSAGES_TOPIC, 1, 7)]
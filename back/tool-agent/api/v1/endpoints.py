@@ -4,19 +4,23 @@ This module defines the FastAPI router and endpoints for the Agent API Service.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from core.agent_manager import agent_manager
+from core.cache import TTLCache, ttl_cached
 from services import get_http_mcp_client
 from .schemas import (
     MessageRequest,
     MessageResponse,
     ToolsResponse,
     RefreshResponse,
-    ToolInfo,
     MCPStatusResponse,
-    MCPServerStatus,
 )
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Dashboards poll /tools and /mcp/status; serve repeats without going back to
+# the MCP service. Cleared by /tools/refresh.
+response_cache = TTLCache(ttl=5.0, max_entries=64)
 
 
 @router.post("/process")
@@ -28,23 +32,28 @@ async def process_message(request: MessageRequest) -> MessageResponse:
     return MessageResponse(response=response)
 
 
-@router.get("/tools", response_model=ToolsResponse)
-async def get_tools():
+# These return a rendered response, which FastAPI sends as is and the cache
+# can replay; the schema is documented through responses= instead of being
+# validated on every request.
+@router.get("/tools", responses={200: {"model": ToolsResponse}})
+@ttl_cached(response_cache, "tools")
+async def get_tools() -> ORJSONResponse:
     """Get all available tools"""
     try:
         http_mcp_client = get_http_mcp_client()
         tools = await http_mcp_client.get_all_tools()
 
-        tool_infos = []
-        for tool in tools:
-            tool_info = ToolInfo(
-                name=tool.get("name", "unknown"),
-                description=tool.get("description", "No description available"),
+        # Tool data comes from our own MCP service, so skip validation
+        tool_infos = [
+            {
+                "name": tool.get("name", "unknown"),
+                "description": tool.get("description", "No description available"),
                 # Add more fields as needed
-            )
-            tool_infos.append(tool_info)
+            }
+            for tool in tools
+        ]
 
-        return ToolsResponse(tools=tool_infos, total=len(tool_infos))
+        return ORJSONResponse({"tools": tool_infos, "total": len(tool_infos)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get tools: {str(e)}")
 
@@ -55,10 +64,12 @@ async def refresh_tools():
     try:
         # Get HTTP MCP client and refresh tools
         http_mcp_client = get_http_mcp_client()
+        http_mcp_client.invalidate()
         tools = await http_mcp_client.get_all_tools()
 
         # Update agent with new tools
         agent_manager.update_tools(tools)
+        response_cache.invalidate("tools", "mcp_status")
 
         return RefreshResponse(
             success=True, message=f"Successfully refreshed {len(tools)} tools"
@@ -69,24 +80,27 @@ async def refresh_tools():
         )
 
 
-@router.get("/mcp/status", response_model=MCPStatusResponse)
-async def get_mcp_status():
+@router.get("/mcp/status", responses={200: {"model": MCPStatusResponse}})
+@ttl_cached(response_cache, "mcp_status")
+async def get_mcp_status() -> ORJSONResponse:
     """Get MCP server status"""
     try:
         http_mcp_client = get_http_mcp_client()
         servers = await http_mcp_client.get_servers()
 
-        server_statuses = []
-        for server in servers:
-            status = MCPServerStatus(
-                name=server.get("name", "unknown"),
-                status="connected" if server.get("running", False) else "disconnected",
-                tools_count=server.get("tool_count", 0),
-            )
-            server_statuses.append(status)
-
-        return MCPStatusResponse(
-            servers=server_statuses, total_servers=len(server_statuses)
+        server_statuses = [
+            {
+                "name": server.get("name", "unknown"),
+                "status": "connected"
+                if server.get("running", False)
+                else "disconnected",
+                "tools_count": server.get("tool_count", 0),
+            }
+            for server in servers
+        ]
+
+        return ORJSONResponse(
+            {"servers": server_statuses, "total_servers": len(server_statuses)}
         )
     except Exception as e:
         raise HTTPException(
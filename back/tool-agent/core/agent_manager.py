@@ -110,7 +110,9 @@ class AgentManager:
             return "Error: Language model is not available. Please configure proper credentials."
 
         agent = await self._get_or_create_agent(session_id)
-        response = agent.invoke({"messages": [{"role": "user", "content": user_input}]})
+        response = await agent.ainvoke(
+            {"messages": [{"role": "user", "content": user_input}]}
+        )
 
         # Extract the final message content from LangGraph response
         if isinstance(response, dict):
@@ -0,0 +1,96 @@
+"""
+Small in-memory caches for API responses.
+"""
+
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+
+class TTLCache:
+    """LRU cache whose entries expire a fixed number of seconds after insertion."""
+
+    def __init__(self, ttl: float, max_entries: int = 64):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: str):
+        """Drop the given keys, or every entry if none are given.
+
+        Args:
+            keys: Cache keys to drop
+        """
+        if not keys:
+            self._entries.clear()
+            return
+
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+def ttl_cached(cache: TTLCache, key: str):
+    """Cache the result of an argument-less async function under a fixed key.
+
+    Exceptions are not cached.
+
+    Args:
+        cache: Cache to store results in
+        key: Key the result is stored under
+
+    Returns:
+        Decorator for the async function
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            value = cache.get(key)
+            if value is None:
+                value = await func(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -5,6 +5,7 @@ Configuration loader for MCP servers and tool-agent settings.
 import os
 import json
 import logging
+import orjson
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from services.mcp_client import MCPServerConfig
@@ -24,6 +25,8 @@ class Config:
         self.config_dir = Path(config_dir)
         self.mcp_servers: List[MCPServerConfig] = []
         self.settings: Dict[str, Any] = {}
+        # mtime of mcp_servers.json when it was last loaded or saved
+        self._mcp_mtime: Optional[float] = None
 
         # Load configuration
         self._load_config()
@@ -61,7 +64,10 @@ class Config:
                 logger.error(f"Failed to load settings from {settings_file}: {e}")
 
     def _load_mcp_servers(self):
-        """Load MCP server configurations."""
+        """Load MCP server configurations.
+
+        Does nothing if mcp_servers.json is unchanged since the last load.
+        """
         if not self.settings.get("enable_mcp", True):
             logger.info("MCP is disabled")
             return
@@ -70,12 +76,18 @@ class Config:
         mcp_config_file = self.config_dir / "mcp_servers.json"
         if mcp_config_file.exists():
             try:
-                with open(mcp_config_file, "r") as f:
-                    mcp_configs = json.load(f)
+                mtime = mcp_config_file.stat().st_mtime
+                if mtime == self._mcp_mtime:
+                    return
 
-                for config_data in mcp_configs.get("servers", []):
-                    server_config = MCPServerConfig(**config_data)
-                    self.mcp_servers.append(server_config)
+                with open(mcp_config_file, "rb") as f:
+                    mcp_configs = orjson.loads(f.read())
+
+                self.mcp_servers = [
+                    MCPServerConfig(**config_data)
+                    for config_data in mcp_configs.get("servers", [])
+                ]
+                self._mcp_mtime = mtime
 
                 logger.info(
                     f"Loaded {len(self.mcp_servers)} MCP server configs from {mcp_config_file}"
@@ -168,8 +180,13 @@ class Config:
                 ]
             }
 
-            with open(mcp_config_file, "w") as f:
-                json.dump(config_data, f, indent=2)
+            # Write a sibling temp file and swap it in so readers never see
+            # a partially written config
+            tmp_file = mcp_config_file.with_suffix(".json.tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, mcp_config_file)
+            self._mcp_mtime = mcp_config_file.stat().st_mtime
 
             logger.info(f"Saved MCP configuration to {mcp_config_file}")
         except Exception as e:
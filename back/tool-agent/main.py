@@ -5,9 +5,20 @@ This module sets up a FastAPI application that provides AI agent capabilities
 for conversation management, tool calling, and message processing using LangChain.
 """
 
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from api.v1.endpoints import router as router_v1
+from services import close_shared_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events."""
+    yield
+    await close_shared_client()
+
 
 app = FastAPI(
     title="Tool Agent API Service",
@@ -16,6 +27,7 @@ app = FastAPI(
     contact={"name": "KieZu Team", "email": "your@email.com"},
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 
@@ -1,9 +1,12 @@
 """Services package initialization."""
 
 from .http_mcp_client import get_http_mcp_client
+from .http_pool import get_shared_client, close_shared_client
 from .http_mcp_tool_adapter import HTTPMCPToolAdapter
 
 __all__ = [
     "get_http_mcp_client",
+    "get_shared_client",
+    "close_shared_client",
     "HTTPMCPToolAdapter",
 ]
@@ -5,13 +5,166 @@ This client communicates with the MCP service via HTTP REST API instead of
 the standard MCP protocol, making it simpler for our microservice architecture.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from types import MappingProxyType
+from typing import Coroutine, List, Dict, Any, Mapping, Optional, Set, Tuple
 import httpx
+import orjson
 import os
 
+from .http_pool import get_shared_client
+
 logger = logging.getLogger(__name__)
 
+# Request bodies are encoded with orjson and sent as raw content
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class ToolCallBatcher:
+    """Coalesces concurrent tool calls into batch requests.
+
+    A call to a tool with no request of its own in flight is sent right
+    away. Calls arriving while one is in flight are gathered for up to
+    max_wait_ms and sent as one request to the MCP service's batch endpoint,
+    up to max_batch at a time. For tools marked read-only, an identical call
+    (same arguments) that is already in flight is shared instead of being
+    sent again.
+    """
+
+    def __init__(
+        self, client: "HTTPMCPClient", max_batch: int = 16, max_wait_ms: float = 5
+    ):
+        """Initialize the batcher.
+
+        Args:
+            client: HTTP MCP client that sends the requests
+            max_batch: Calls sent in one batch request at most
+            max_wait_ms: How long the first call of a batch waits for others
+        """
+        self.client = client
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        # (server, tool) -> calls waiting to be sent
+        self._pending: Dict[Tuple[str, str], List[Tuple[Dict, asyncio.Future]]] = {}
+        # (server, tool, arguments) -> result of the read-only call in flight
+        self._in_flight: Dict[Tuple[str, str, bytes], asyncio.Future] = {}
+        # (server, tool) -> requests currently being sent
+        self._sending: Dict[Tuple[str, str], int] = {}
+        # Strong references to send tasks until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def call(
+        self, server_name: str, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Queue a tool call and wait for its result.
+
+        Args:
+            server_name: Name of the server
+            tool_name: Name of the tool
+            arguments: Tool arguments
+
+        Returns:
+            Tool result
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        # Sharing results is only safe for calls without side effects
+        if self.client.is_read_only(server_name, tool_name):
+            call_key = (
+                server_name,
+                tool_name,
+                orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS, default=str),
+            )
+            shared = self._in_flight.get(call_key)
+            if shared is not None:
+                return await asyncio.shield(shared)
+            self._in_flight[call_key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(call_key, None))
+
+        key = (server_name, tool_name)
+        batch = self._pending.get(key)
+        if batch is None:
+            if not self._sending.get(key):
+                # Nothing to coalesce with, so don't wait for company
+                self._dispatch(key, [(arguments, future)])
+                return await asyncio.shield(future)
+            batch = self._pending[key] = []
+            self._spawn(self._flush_after(key, batch))
+        batch.append((arguments, future))
+        if len(batch) >= self.max_batch:
+            self._take(key, batch)
+            self._dispatch(key, batch)
+
+        return await asyncio.shield(future)
+
+    def _spawn(self, coro: Coroutine) -> None:
+        """Run a coroutine in a task that is kept referenced until done."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _dispatch(self, key: Tuple[str, str], batch: List) -> None:
+        """Start sending a batch, counting it as in flight right away."""
+        self._sending[key] = self._sending.get(key, 0) + 1
+        self._spawn(self._send(key, batch))
+
+    def _take(self, key: Tuple[str, str], batch: List) -> bool:
+        """Detach a batch from the pending map if it is still there."""
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+            return True
+        return False
+
+    async def _flush_after(self, key: Tuple[str, str], batch: List):
+        """Send a batch once max_wait has passed, unless it filled up first."""
+        await asyncio.sleep(self.max_wait)
+        if self._take(key, batch):
+            self._dispatch(key, batch)
+
+    async def _send(self, key: Tuple[str, str], batch: List):
+        """Send a batch and hand each result to its future."""
+        try:
+            await self._send_batch(key, batch)
+        finally:
+            remaining = self._sending[key] - 1
+            if remaining:
+                self._sending[key] = remaining
+            else:
+                del self._sending[key]
+
+    async def _send_batch(self, key: Tuple[str, str], batch: List):
+        """Send one request for a batch and settle its futures."""
+        server_name, tool_name = key
+        try:
+            if len(batch) == 1:
+                arguments, future = batch[0]
+                items = [
+                    {
+                        "result": await self.client._post_tool_call(
+                            server_name, tool_name, arguments
+                        )
+                    }
+                ]
+            else:
+                items = await self.client._post_tool_batch(
+                    server_name, tool_name, [arguments for arguments, _ in batch]
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), item in zip(batch, items):
+            if future.done():
+                continue
+            if item.get("error"):
+                future.set_exception(Exception(f"MCP tool error: {item['error']}"))
+            else:
+                future.set_result(item.get("result", {}))
+
 
 class HTTPMCPClient:
     """HTTP-based MCP client for communicating with MCP microservice."""
@@ -26,7 +179,30 @@ class HTTPMCPClient:
             "MCP_SERVICE_URL", "http://mcp-service:3005"
         )
         self.servers_cache: Dict[str, Dict[str, Any]] = {}
-        self.tools_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Tool definitions are read-only views, shared with every caller
+        self.tools_cache: Dict[str, List[Mapping[str, Any]]] = {}
+
+        # Merged get_all_tools() result, reused until it expires
+        self._all_tools: List[Mapping[str, Any]] = []
+        self._tools_cache_expires_at: float = 0.0
+        self._tools_ttl = float(os.getenv("MCP_TOOLS_CACHE_TTL", "60"))
+        # Last ETag per server, for conditional tool list requests
+        self._tools_etags: Dict[str, str] = {}
+        # (server, tool) pairs the MCP service marks as free of side effects
+        self._read_only_tools: Set[Tuple[str, str]] = set()
+
+        self.batcher = ToolCallBatcher(self)
+        # Servers queried at the same time by get_all_tools()
+        self._concurrency = asyncio.Semaphore(8)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for MCP service requests.
+
+        Returns:
+            The process-wide pooled async HTTP client
+        """
+        return get_shared_client()
 
     async def get_servers(self) -> List[Dict[str, Any]]:
         """Get list of available MCP servers.
@@ -35,54 +211,82 @@ class HTTPMCPClient:
             List of server information
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{self.mcp_service_url}/servers")
-                response.raise_for_status()
+            response = await self.client.get(f"{self.mcp_service_url}/servers")
+            response.raise_for_status()
 
-                servers = response.json()
+            servers = orjson.loads(response.content)
 
-                # Cache server info
-                for server in servers:
-                    self.servers_cache[server["name"]] = server
+            # Cache server info
+            for server in servers:
+                self.servers_cache[server["name"]] = server
 
-                logger.info(f"Retrieved {len(servers)} servers from MCP service")
-                return servers
+            logger.info(f"Retrieved {len(servers)} servers from MCP service")
+            return servers
 
         except Exception as e:
             logger.error(f"Failed to get servers from MCP service: {e}")
             return []
 
-    async def get_server_tools(self, server_name: str) -> List[Dict[str, Any]]:
+    async def get_server_tools(self, server_name: str) -> List[Mapping[str, Any]]:
         """Get tools available from a specific server.
 
         Args:
             server_name: Name of the server
 
         Returns:
-            List of tool definitions
+            List of read-only tool definitions, tagged with their server
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.mcp_service_url}/servers/{server_name}/tools"
-                )
-                response.raise_for_status()
-
-                result = response.json()
-                tools = result.get("tools", [])
+            headers = {}
+            etag = self._tools_etags.get(server_name)
+            if etag and server_name in self.tools_cache:
+                headers["If-None-Match"] = etag
 
-                # Cache tools
-                self.tools_cache[server_name] = tools
+            response = await self.client.get(
+                f"{self.mcp_service_url}/servers/{server_name}/tools", headers=headers
+            )
+            if response.status_code == 304:
+                return list(self.tools_cache[server_name])
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            # Tagged once here; the cached definitions are then shared by all
+            # callers, so they are handed out read-only
+            tools = [
+                MappingProxyType({**tool, "server": server_name})
+                for tool in result.get("tools", [])
+            ]
+
+            # Cache tools
+            self.tools_cache[server_name] = tools
+            self._read_only_tools = {
+                key for key in self._read_only_tools if key[0] != server_name
+            }
+            self._read_only_tools.update(
+                (server_name, tool["name"]) for tool in tools if tool.get("read_only")
+            )
+            if "etag" in response.headers:
+                self._tools_etags[server_name] = response.headers["etag"]
 
-                logger.debug(
-                    f"Retrieved {len(tools)} tools from server '{server_name}'"
-                )
-                return tools
+            logger.debug(f"Retrieved {len(tools)} tools from server '{server_name}'")
+            return list(tools)
 
         except Exception as e:
             logger.error(f"Failed to get tools from server '{server_name}': {e}")
             return []
 
+    def is_read_only(self, server_name: str, tool_name: str) -> bool:
+        """Tell whether a tool is known to have no side effects.
+
+        Args:
+            server_name: Name of the server
+            tool_name: Name of the tool
+
+        Returns:
+            True if the tool list marked it read_only
+        """
+        return (server_name, tool_name) in self._read_only_tools
+
     async def call_tool(
         self, server_name: str, tool_name: str, arguments: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -97,46 +301,113 @@ class HTTPMCPClient:
             Tool result
         """
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.mcp_service_url}/servers/{server_name}/tools/{tool_name}",
-                    json=arguments,
-                )
-                response.raise_for_status()
-
-                result = response.json()
-                return result.get("result", {})
+            return await self.batcher.call(server_name, tool_name, arguments)
 
         except Exception as e:
             logger.error(
-                f"Failed to call tool '{tool_name}' on server '{server_name}': {e}"
+                "Failed to call tool '%s' on server '%s': %s", tool_name, server_name, e
             )
             raise
 
-    async def get_all_tools(self) -> List[Dict[str, Any]]:
+    async def _post_tool_call(
+        self, server_name: str, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Send a single tool call.
+
+        Args:
+            server_name: Name of the server
+            tool_name: Name of the tool
+            arguments: Tool arguments
+
+        Returns:
+            Tool result
+        """
+        response = await self.client.post(
+            f"{self.mcp_service_url}/servers/{server_name}/tools/{tool_name}",
+            content=orjson.dumps(arguments),
+            headers=JSON_HEADERS,
+            timeout=60.0,
+        )
+        response.raise_for_status()
+
+        result = orjson.loads(response.content)
+        return result.get("result", {})
+
+    async def _post_tool_batch(
+        self, server_name: str, tool_name: str, arguments_list: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Send several calls of one tool in a single request.
+
+        Args:
+            server_name: Name of the server
+            tool_name: Name of the tool
+            arguments_list: Arguments of each call
+
+        Returns:
+            One {"result": ...} or {"error": ...} entry per call, in order
+        """
+        response = await self.client.post(
+            f"{self.mcp_service_url}/servers/{server_name}/tools/{tool_name}/batch",
+            content=orjson.dumps(arguments_list),
+            headers=JSON_HEADERS,
+            timeout=60.0,
+        )
+        response.raise_for_status()
+
+        return orjson.loads(response.content)["results"]
+
+    async def get_all_tools(self) -> List[Mapping[str, Any]]:
         """Get all tools from all servers.
 
+        The merged list is cached for MCP_TOOLS_CACHE_TTL seconds; after
+        that, unchanged servers are revalidated with their ETag.
+
         Returns:
-            List of all available tools
+            List of all available tools, as read-only definitions
         """
+        if time.monotonic() < self._tools_cache_expires_at:
+            return list(self._all_tools)
+
         all_tools = []
 
         # Get all servers
         servers = await self.get_servers()
 
-        # Get tools from each server
-        for server in servers:
-            server_name = server["name"]
-            tools = await self.get_server_tools(server_name)
+        # Get tools from all servers concurrently
+        server_names = [server["name"] for server in servers]
+        results = await asyncio.gather(
+            *(self._get_server_tools_limited(name) for name in server_names),
+            return_exceptions=True,
+        )
+
+        for server_name, tools in zip(server_names, results):
+            if isinstance(tools, Exception):
+                logger.error(
+                    f"Failed to get tools from server '{server_name}': {tools}"
+                )
+                continue
 
-            # Add server context to each tool
-            for tool in tools:
-                tool_with_server = tool.copy()
-                tool_with_server["server"] = server_name
-                all_tools.append(tool_with_server)
+            # Already tagged with server_name by get_server_tools()
+            all_tools.extend(tools)
 
         logger.info(f"Retrieved {len(all_tools)} total tools from MCP service")
-        return all_tools
+
+        # An empty result may just mean the MCP service is unreachable
+        if all_tools:
+            self._all_tools = all_tools
+            self._tools_cache_expires_at = time.monotonic() + self._tools_ttl
+        return list(all_tools)
+
+    async def _get_server_tools_limited(
+        self, server_name: str
+    ) -> List[Mapping[str, Any]]:
+        """get_server_tools() under the fan-out concurrency limit."""
+        async with self._concurrency:
+            return await self.get_server_tools(server_name)
+
+    def invalidate(self):
+        """Make the next get_all_tools() call go back to the MCP service."""
+        self._tools_cache_expires_at = 0.0
 
     async def check_health(self) -> bool:
         """Check if MCP service is healthy.
@@ -145,9 +416,10 @@ class HTTPMCPClient:
             True if service is healthy
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.mcp_service_url}/health")
-                return response.status_code == 200
+            response = await self.client.get(
+                f"{self.mcp_service_url}/health", timeout=10.0
+            )
+            return response.status_code == 200
 
         except Exception as e:
             logger.warning(f"MCP service health check failed: {e}")
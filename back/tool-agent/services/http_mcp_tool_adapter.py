@@ -5,8 +5,10 @@ Converts HTTP MCP responses to LangChain tools for the agent manager.
 """
 
 import asyncio
+import functools
 import logging
-from typing import List, Dict, Any, Type
+import orjson
+from typing import Callable, List, Dict, Any, Mapping, Optional, Tuple, Type
 from langchain.tools import Tool, StructuredTool
 from pydantic import BaseModel, Field, create_model
 
@@ -14,6 +16,104 @@ from .http_mcp_client import HTTPMCPClient
 
 logger = logging.getLogger(__name__)
 
+# Seconds a synchronous tool call waits for its result
+TOOL_CALL_TIMEOUT = 60.0
+
+
+# Input schemas of known tools, keyed by (server_name, tool_name). Built
+# lazily, so only the tools a deployment actually exposes create a class.
+_TOOL_SCHEMAS: Dict[Tuple[str, str], Callable[[], Type[BaseModel]]] = {
+    ("calculator", "calculate"): lambda: create_model(
+        "calculator_calculate_Input",
+        expression=(str, Field(description="Mathematical expression to evaluate")),
+    ),
+    ("calculator", "calculate_statistics"): lambda: create_model(
+        "calculator_calculate_statistics_Input",
+        data=(str, Field(description="Comma-separated list of numbers")),
+    ),
+    ("calculator", "convert_units"): lambda: create_model(
+        "calculator_convert_units_Input",
+        value=(float, Field(description="Value to convert")),
+        from_unit=(str, Field(description="Source unit")),
+        to_unit=(str, Field(description="Target unit")),
+    ),
+    ("calculator", "list_math_functions"): lambda: create_model(
+        "calculator_list_math_functions_Input"
+    ),
+    ("webscraper", "scrape_webpage"): lambda: create_model(
+        "webscraper_scrape_webpage_Input",
+        url=(str, Field(description="URL to scrape")),
+        selector=(str, Field(description="CSS selector", default="")),
+    ),
+    ("webscraper", "extract_text"): lambda: create_model(
+        "webscraper_extract_text_Input",
+        url=(str, Field(description="URL to extract text from")),
+    ),
+}
+
+
+def _to_text(value: Any) -> str:
+    """Render a tool value for the agent; containers as JSON, the rest as str."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value, default=str).decode()
+    return str(value)
+
+
+def _format_tool_result(result: Any) -> str:
+    """Turn an MCP tool result into the text handed back to the agent.
+
+    Args:
+        result: Result returned by the MCP service
+
+    Returns:
+        Text for the agent
+    """
+    if not isinstance(result, dict):
+        return _to_text(result)
+
+    error = result.get("error")
+    if error:
+        return f"Error: {error}"
+
+    if "result" in result:
+        nested = result["result"]
+        # Servers like the calculator wrap their value in another envelope
+        if isinstance(nested, dict):
+            if not nested.get("success", True):
+                return f"Error: {nested.get('error', 'Unknown error')}"
+            if "result" in nested:
+                return f"Result: {nested['result']}"
+        return _to_text(nested)
+
+    return _to_text(result.get("content", result))
+
+
+class ToolArgumentsInput(BaseModel):
+    """Input schema for tools without a dedicated schema."""
+
+    arguments: Dict[str, Any] = Field(
+        description="Tool arguments", default_factory=dict
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_input_schema(tool_name: str, server_name: str) -> Type[BaseModel]:
+    """Get the input schema for a tool.
+
+    Cached, so each schema class is created at most once per process.
+
+    Args:
+        tool_name: Name of the tool
+        server_name: Name of the server
+
+    Returns:
+        Pydantic model class for tool input
+    """
+    build = _TOOL_SCHEMAS.get((server_name, tool_name))
+    return build() if build else ToolArgumentsInput
+
 
 class HTTPMCPToolAdapter:
     """Adapts HTTP MCP tools to LangChain tools."""
@@ -26,6 +126,10 @@ class HTTPMCPToolAdapter:
         """
         self.http_client = http_client
         self.tools_cache: List[Tool] = []
+        # (server, tool) -> (description, tool) built by earlier loads
+        self._tool_by_key: Dict[Tuple[str, str], Tuple[str, StructuredTool]] = {}
+        # Loop that owns the shared HTTP client; sync tool calls run on it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def load_tools(self) -> List[Tool]:
         """Load all tools from HTTP MCP service and convert to LangChain tools.
@@ -33,17 +137,33 @@ class HTTPMCPToolAdapter:
         Returns:
             List of LangChain tools
         """
+        self._loop = asyncio.get_running_loop()
+
         try:
             # Get all tools from MCP service
             mcp_tools = await self.http_client.get_all_tools()
 
             langchain_tools = []
+            tool_by_key = {}
 
             for mcp_tool in mcp_tools:
-                langchain_tool = self._create_langchain_tool(mcp_tool)
+                key = (mcp_tool.get("server"), mcp_tool.get("name"))
+                description = mcp_tool.get("description")
+
+                # Only new or changed tools are rebuilt; schemas depend on
+                # the key alone
+                known = self._tool_by_key.get(key)
+                if known is not None and known[0] == description:
+                    langchain_tool = known[1]
+                else:
+                    langchain_tool = self._create_langchain_tool(mcp_tool)
+
                 if langchain_tool:
                     langchain_tools.append(langchain_tool)
+                    tool_by_key[key] = (description, langchain_tool)
 
+            # Tools the service no longer lists are dropped
+            self._tool_by_key = tool_by_key
             self.tools_cache = langchain_tools
             logger.info(f"Loaded {len(langchain_tools)} tools from HTTP MCP service")
             return langchain_tools
@@ -64,54 +184,9 @@ class HTTPMCPToolAdapter:
         Returns:
             Pydantic model class for tool input
         """
-        # Create tool-specific input schemas
-        if server_name == "calculator":
-            if tool_name == "calculate":
-                return create_model(
-                    f"{server_name}_{tool_name}_Input",
-                    expression=(
-                        str,
-                        Field(description="Mathematical expression to evaluate"),
-                    ),
-                )
-            elif tool_name == "calculate_statistics":
-                return create_model(
-                    f"{server_name}_{tool_name}_Input",
-                    data=(str, Field(description="Comma-separated list of numbers")),
-                )
-            elif tool_name == "convert_units":
-                return create_model(
-                    f"{server_name}_{tool_name}_Input",
-                    value=(float, Field(description="Value to convert")),
-                    from_unit=(str, Field(description="Source unit")),
-                    to_unit=(str, Field(description="Target unit")),
-                )
-            elif tool_name == "list_math_functions":
-                return create_model(f"{server_name}_{tool_name}_Input")
-
-        elif server_name == "webscraper":
-            if tool_name == "scrape_webpage":
-                return create_model(
-                    f"{server_name}_{tool_name}_Input",
-                    url=(str, Field(description="URL to scrape")),
-                    selector=(str, Field(description="CSS selector", default="")),
-                )
-            elif tool_name == "extract_text":
-                return create_model(
-                    f"{server_name}_{tool_name}_Input",
-                    url=(str, Field(description="URL to extract text from")),
-                )
-
-        # Default fallback
-        return create_model(
-            f"{server_name}_{tool_name}_Input",
-            arguments=(
-                Dict[str, Any],
-                Field(description="Tool arguments", default_factory=dict),
-            ),
-        )
-
-    def _create_langchain_tool(self, mcp_tool: Dict[str, Any]) -> Tool:
+        return _tool_input_schema(tool_name, server_name)
+
+    def _create_langchain_tool(self, mcp_tool: Mapping[str, Any]) -> Tool:
         """Create LangChain tool from HTTP MCP tool definition.
 
         Args:
@@ -134,35 +209,12 @@ class HTTPMCPToolAdapter:
             # Get appropriate input schema
             input_schema = self._get_tool_input_schema(tool_name, server_name)
 
-            def tool_func(**kwargs) -> str:
-                """Tool function that calls HTTP MCP service."""
-                try:
-                    try:
-                        # If we're in an event loop, we need to create a task
-                        import concurrent.futures
-
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(
-                                asyncio.run,
-                                self._async_tool_call(server_name, tool_name, kwargs),
-                            )
-                            result = future.result()
-                    except RuntimeError:
-                        # No event loop running, we can use asyncio.run directly
-                        result = asyncio.run(
-                            self._async_tool_call(server_name, tool_name, kwargs)
-                        )
-
-                    return result
-
-                except Exception as e:
-                    error_msg = f"Error calling HTTP MCP tool {tool_name}: {str(e)}"
-                    logger.error(error_msg)
-                    return error_msg
-
-            # Create structured tool
+            # Create structured tool; async agents use the coroutine directly
             return StructuredTool.from_function(
-                func=tool_func,
+                func=functools.partial(self._sync_tool_invoke, server_name, tool_name),
+                coroutine=functools.partial(
+                    self._tool_coroutine, server_name, tool_name
+                ),
                 name=f"{server_name}_{tool_name}",
                 description=tool_description,
                 args_schema=input_schema,
@@ -174,42 +226,64 @@ class HTTPMCPToolAdapter:
             )
             return None
 
+    async def _tool_coroutine(
+        self, server_name: str, tool_name: str, /, **kwargs
+    ) -> str:
+        """Tool coroutine that calls HTTP MCP service."""
+        return await self._async_tool_call(server_name, tool_name, kwargs)
+
+    def _sync_tool_invoke(self, server_name: str, tool_name: str, /, **kwargs) -> str:
+        """Tool function for sync callers, run on the adapter's loop."""
+        try:
+            return self._run_on_loop(
+                self._tool_coroutine(server_name, tool_name, **kwargs)
+            )
+
+        except Exception as e:
+            logger.error("Error calling HTTP MCP tool %s: %s", tool_name, e)
+            return f"Error calling HTTP MCP tool {tool_name}: {e}"
+
+    def _run_on_loop(self, coro) -> str:
+        """Run a coroutine on the adapter's event loop from another thread.
+
+        This keeps every call on the loop that owns the pooled HTTP client
+        instead of starting a new loop per call.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # No loop has loaded the tools yet
+            return asyncio.run(coro)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError(
+                "Synchronous tool call on the event loop thread; use the async tool"
+            )
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result(timeout=TOOL_CALL_TIMEOUT)
+
     async def _async_tool_call(
         self, server_name: str, tool_name: str, arguments: Dict[str, Any]
     ) -> str:
         """Async tool call wrapper."""
         try:
             result = await self.http_client.call_tool(server_name, tool_name, arguments)
-
-            # Format result as string
-            if isinstance(result, dict):
-                if "error" in result and result["error"]:
-                    return f"Error: {result['error']}"
-                elif "result" in result:
-                    nested_result = result["result"]
-                    if isinstance(nested_result, dict):
-                        # Handle nested result structure (like calculator returns)
-                        if "success" in nested_result and not nested_result["success"]:
-                            return (
-                                f"Error: {nested_result.get('error', 'Unknown error')}"
-                            )
-                        elif "result" in nested_result:
-                            return f"Result: {nested_result['result']}"
-                        else:
-                            return str(nested_result)
-                    else:
-                        return str(nested_result)
-                elif "content" in result:
-                    return str(result["content"])
-                else:
-                    return str(result)
-            else:
-                return str(result)
-
         except Exception as e:
-            error_msg = f"Error calling HTTP MCP tool {tool_name}: {str(e)}"
-            logger.error(error_msg)
-            return error_msg
+            logger.error("Error calling HTTP MCP tool %s: %s", tool_name, e)
+            return f"Error calling HTTP MCP tool {tool_name}: {e}"
+
+        return _format_tool_result(result)
 
     def get_cached_tools(self) -> List[Tool]:
         """Get cached tools.
@@ -226,4 +300,5 @@ class HTTPMCPToolAdapter:
             Updated list of tools
         """
         self.tools_cache.clear()
+        self.http_client.invalidate()
         return await self.load_tools()
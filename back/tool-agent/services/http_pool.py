@@ -0,0 +1,46 @@
+"""
+Process-wide HTTP connection pool.
+
+Every MCP client shares one httpx.AsyncClient, so requests to the same host
+reuse the same keep-alive (and, over TLS, HTTP/2) connections.
+"""
+
+from typing import Optional
+
+import httpx
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use.
+
+    No await happens between the check and the creation, so concurrent
+    callers on the event loop cannot create two.
+
+    Returns:
+        The pooled async HTTP client
+    """
+    global _shared_client
+
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+
+    return _shared_client
+
+
+async def close_shared_client():
+    """Close the shared HTTP client, if it was created."""
+    global _shared_client
+
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -6,15 +6,37 @@ and load tools through the Model Context Protocol standard.
 """
 
 import asyncio
-import json
+import functools
+import itertools
 import logging
 from typing import List, Dict, Any, Optional, Union
 from langchain.tools import Tool, StructuredTool
 from pydantic import BaseModel, Field, model_validator
-import httpx
+import orjson
+
+from .http_pool import get_shared_client
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a stdio MCP server to answer a request
+STDIO_REQUEST_TIMEOUT = 30.0
+
+# Seconds a synchronous tool call waits for its result
+TOOL_CALL_TIMEOUT = 60.0
+
+# MCP servers started or queried at the same time during tool loading
+MAX_CONCURRENT_SERVERS = 8
+
+# Shared "params" for requests without any; only ever serialized, never mutated
+_EMPTY_PARAMS: Dict[str, Any] = {}
+
+# Params of the "initialize" request opening every session
+_INITIALIZE_PARAMS: Dict[str, Any] = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "clientInfo": {"name": "tool-agent-mcp-client", "version": "1.0.0"},
+}
+
 
 class MCPToolInput(BaseModel):
     """Input schema for MCP tools."""
@@ -64,12 +86,33 @@ class MCPClient:
         """
         self.server_config = server_config
         self.tools_cache: Dict[str, Dict[str, Any]] = {}
-        self._message_id = 0
+        self._id_iter = itertools.count(1)
+
+        # Resident process for stdio-based servers
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stdio_lock = asyncio.Lock()
+        self._process_lock = asyncio.Lock()
+        self._response_futures: Dict[int, asyncio.Future] = {}
+
+    async def aclose(self):
+        """Stop the server process, if any."""
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            # Closing stdin is the stdio transport's shutdown signal
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), 5.0)
+            except asyncio.TimeoutError:
+                process.terminate()
+                await process.wait()
 
-    def _next_message_id(self) -> int:
-        """Get next message ID."""
-        self._message_id += 1
-        return self._message_id
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None:
+                await task
+        self._reader_task = None
+        self._stderr_task = None
 
     async def _send_mcp_request(
         self, method: str, params: Optional[Dict[str, Any]] = None
@@ -103,26 +146,25 @@ class MCPClient:
             Response result
         """
         try:
-            message = {
-                "jsonrpc": "2.0",
-                "id": self._next_message_id(),
-                "method": method,
-                "params": params or {},
-            }
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.server_config.url,
-                    json=message,
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
-
-                result = response.json()
-                if "error" in result:
-                    raise Exception(f"MCP error: {result['error']}")
-
-                return result.get("result", {})
+            response = await get_shared_client().post(
+                self.server_config.url,
+                content=orjson.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": next(self._id_iter),
+                        "method": method,
+                        "params": _EMPTY_PARAMS if params is None else params,
+                    }
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            if "error" in result:
+                raise Exception(f"MCP error: {result['error']}")
+
+            return result.get("result", {})
 
         except Exception as e:
             logger.error(f"HTTP MCP request failed: {e}")
@@ -133,6 +175,9 @@ class MCPClient:
     ) -> Dict[str, Any]:
         """Send request to process-based MCP server via stdio.
 
+        The server process is started on first use and kept running; responses
+        are matched to requests by id.
+
         Args:
             method: MCP method name
             params: Method parameters
@@ -141,58 +186,142 @@ class MCPClient:
             Response result
         """
         try:
-            # Create message
-            message = {
-                "jsonrpc": "2.0",
-                "id": self._next_message_id(),
-                "method": method,
-                "params": params or {},
-            }
-
-            # Start MCP server process
-            cmd = self.server_config.command
+            # An "initialize" request performs the handshake itself
+            await self._ensure_process(handshake=method != "initialize")
+            return await self._stdio_call(method, params)
+
+        except Exception as e:
+            logger.error(f"Stdio MCP request failed: {e}")
+            raise
+
+    async def _stdio_call(
+        self, method: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Write a message to the running server process and await its response.
+
+        Args:
+            method: MCP method name
+            params: Method parameters
+
+        Returns:
+            Response result, or an empty dict for notifications
+        """
+        # Notifications carry no id and get no response
+        message = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": _EMPTY_PARAMS if params is None else params,
+        }
+        future = None
+        if not method.startswith("notifications/"):
+            message_id = next(self._id_iter)
+            message["id"] = message_id
+            future = asyncio.get_running_loop().create_future()
+            self._response_futures[message_id] = future
+
+        async with self._stdio_lock:
+            self._process.stdin.write(orjson.dumps(message) + b"\n")
+            await self._process.stdin.drain()
+
+        if future is None:
+            return {}
+
+        try:
+            result = await asyncio.wait_for(future, STDIO_REQUEST_TIMEOUT)
+        finally:
+            self._response_futures.pop(message["id"], None)
+
+        if "error" in result:
+            raise Exception(f"MCP error: {result['error']}")
+
+        return result.get("result", {})
+
+    async def _ensure_process(self, handshake: bool = True):
+        """Start the MCP server process and its response reader if not running.
+
+        Args:
+            handshake: Whether to open the MCP session on a newly started
+                process. A process that died and was restarted knows nothing
+                of the session initialize() opened on its predecessor.
+        """
+        async with self._process_lock:
+            if self._process is not None and self._process.returncode is None:
+                return
+
+            cmd = list(self.server_config.command)
             if self.server_config.args:
                 cmd.extend(self.server_config.args)
 
             env = self.server_config.env or {}
 
-            process = await asyncio.create_subprocess_exec(
+            self._process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 env={**env},
             )
+            self._reader_task = asyncio.create_task(self._read_responses(self._process))
+            self._stderr_task = asyncio.create_task(self._drain_stderr(self._process))
+            logger.info(
+                f"Started MCP server process {self.server_config.name} "
+                f"(pid {self._process.pid})"
+            )
 
-            # Send message
-            message_json = json.dumps(message) + "\n"
-            process.stdin.write(message_json.encode())
-            await process.stdin.drain()
-            process.stdin.close()
-
-            # Read response
-            stdout, stderr = await process.communicate()
-
-            if stderr:
-                logger.warning(f"MCP server stderr: {stderr.decode()}")
-
-            if process.returncode != 0:
-                raise Exception(f"MCP server exited with code {process.returncode}")
-
-            # Parse response
-            response_text = stdout.decode().strip()
-            if not response_text:
-                raise Exception("Empty response from MCP server")
-
-            result = json.loads(response_text)
-            if "error" in result:
-                raise Exception(f"MCP error: {result['error']}")
+            if not handshake:
+                return
+            try:
+                await self._stdio_call("initialize", _INITIALIZE_PARAMS)
+                await self._stdio_call("notifications/initialized")
+            except Exception:
+                # Never leave an uninitialized process for later requests
+                if self._process.returncode is None:
+                    self._process.kill()
+                    await self._process.wait()
+                raise
+
+    async def _read_responses(self, process: asyncio.subprocess.Process):
+        """Resolve pending requests from the server's newline-delimited output.
 
-            return result.get("result", {})
+        Args:
+            process: MCP server process to read from
+        """
+        try:
+            while True:
+                # One JSON-RPC message per line; orjson accepts the newline
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    if line.strip():
+                        logger.warning(f"Ignoring non-JSON MCP server output: {line!r}")
+                    continue
+
+                future = self._response_futures.get(message.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(message)
+        finally:
+            # The process is gone; nothing else will answer these
+            for future in self._response_futures.values():
+                if not future.done():
+                    future.set_exception(Exception("MCP server process exited"))
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process):
+        """Log the server's stderr line by line so the pipe never fills up.
 
-        except Exception as e:
-            logger.error(f"Stdio MCP request failed: {e}")
-            raise
+        Args:
+            process: MCP server process to read from
+        """
+        name = self.server_config.name
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+            logger.warning(
+                f"MCP server {name} stderr: {line.decode(errors='replace').rstrip()}"
+            )
 
     async def initialize(self) -> bool:
         """Initialize connection to MCP server.
@@ -202,14 +331,7 @@ class MCPClient:
         """
         try:
             # Send initialize request
-            result = await self._send_mcp_request(
-                "initialize",
-                {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {"tools": {}},
-                    "clientInfo": {"name": "tool-agent-mcp-client", "version": "1.0.0"},
-                },
-            )
+            result = await self._send_mcp_request("initialize", _INITIALIZE_PARAMS)
 
             logger.info(f"MCP server initialized: {result}")
 
@@ -281,24 +403,33 @@ class MCPToolLoader:
         self.mcp_servers = mcp_servers
         self.clients: Dict[str, MCPClient] = {}
         self.loaded_tools: Dict[str, Tool] = {}
+        # Loop the clients were initialized on; sync tool calls run on it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._concurrency = asyncio.Semaphore(MAX_CONCURRENT_SERVERS)
 
-    async def initialize_clients(self) -> None:
-        """Initialize all MCP clients."""
-        for server_config in self.mcp_servers:
-            try:
-                client = MCPClient(server_config)
-                success = await client.initialize()
-
-                if success:
-                    self.clients[server_config.name] = client
-                    logger.info(f"Initialized MCP client for {server_config.name}")
-                else:
-                    logger.error(
-                        f"Failed to initialize MCP client for {server_config.name}"
-                    )
+    async def _limited(self, coro):
+        """Await a coroutine while holding a server concurrency slot."""
+        async with self._concurrency:
+            return await coro
 
-            except Exception as e:
-                logger.error(f"Error initializing MCP client {server_config.name}: {e}")
+    async def initialize_clients(self) -> None:
+        """Initialize all MCP clients concurrently."""
+        self._loop = asyncio.get_running_loop()
+        clients = [MCPClient(server_config) for server_config in self.mcp_servers]
+        results = await asyncio.gather(
+            *(self._limited(client.initialize()) for client in clients),
+            return_exceptions=True,
+        )
+
+        for client, success in zip(clients, results):
+            server_name = client.server_config.name
+            if isinstance(success, Exception):
+                logger.error(f"Error initializing MCP client {server_name}: {success}")
+            elif success:
+                self.clients[server_name] = client
+                logger.info(f"Initialized MCP client for {server_name}")
+            else:
+                logger.error(f"Failed to initialize MCP client for {server_name}")
 
     async def load_tools(self) -> List[Tool]:
         """Load all tools from all MCP servers.
@@ -312,10 +443,17 @@ class MCPToolLoader:
         if not self.clients:
             await self.initialize_clients()
 
-        # Load tools from each client
-        for server_name, client in self.clients.items():
+        # List tools from all clients concurrently
+        clients = list(self.clients.items())
+        results = await asyncio.gather(
+            *(self._limited(client.list_tools()) for _, client in clients),
+            return_exceptions=True,
+        )
+
+        for (server_name, client), mcp_tools in zip(clients, results):
             try:
-                mcp_tools = await client.list_tools()
+                if isinstance(mcp_tools, Exception):
+                    raise mcp_tools
 
                 for mcp_tool in mcp_tools:
                     langchain_tool = self._create_langchain_tool(client, mcp_tool)
@@ -376,7 +514,9 @@ class MCPToolLoader:
                             else:
                                 return str(content)
                         else:
-                            return json.dumps(result, indent=2)
+                            return orjson.dumps(
+                                result, option=orjson.OPT_INDENT_2
+                            ).decode()
                     else:
                         return str(result)
 
@@ -385,9 +525,9 @@ class MCPToolLoader:
                     logger.error(error_msg)
                     return error_msg
 
-            # Create structured tool
+            # Create structured tool; async agents await the coroutine directly
             return StructuredTool.from_function(
-                func=lambda arguments: asyncio.run(tool_func(arguments)),
+                func=functools.partial(self._call_tool_sync, tool_func),
                 name=tool_name,
                 description=tool_description,
                 args_schema=MCPToolInput,
@@ -400,6 +540,35 @@ class MCPToolLoader:
             )
             return None
 
+    def _call_tool_sync(self, tool_func, arguments: Dict[str, Any]) -> str:
+        """Run an async tool function for a sync caller.
+
+        The call is handed to the loop the clients live on, so their HTTP
+        pools and server processes are reused.
+
+        Args:
+            tool_func: Async tool function
+            arguments: Tool arguments
+
+        Returns:
+            Tool result
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return asyncio.run(tool_func(arguments))
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError(
+                "Synchronous tool call on the event loop thread; use the async tool"
+            )
+
+        future = asyncio.run_coroutine_threadsafe(tool_func(arguments), loop)
+        return future.result(timeout=TOOL_CALL_TIMEOUT)
+
     async def refresh_tools(self) -> List[Tool]:
         """Refresh tools from all MCP servers.
 
@@ -417,6 +586,11 @@ class MCPToolLoader:
         """
         return list(self.loaded_tools.values())
 
+    async def aclose(self):
+        """Stop the server processes of all MCP clients."""
+        for client in self.clients.values():
+            await client.aclose()
+
 
 # Global MCP tool loader instance
 _mcp_tool_loader: Optional[MCPToolLoader] = None
@@ -0,0 +1,92 @@
+"""
+Tests for the TTL cache.
+"""
+
+import asyncio
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Loaded by path: importing the core package starts the agent stack
+_spec = importlib.util.spec_from_file_location(
+    "tool_agent_cache",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "core", "cache.py"),
+)
+cache_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cache_module)
+TTLCache = cache_module.TTLCache
+ttl_cached = cache_module.ttl_cached
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Only the cache's clock; the event loop keeps the real one
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=10)
+    cache.set("k", "v")
+
+    clock.now += 9.9
+    assert cache.get("k") == "v"
+    clock.now += 0.1
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(ttl=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate_given_keys_or_everything(clock):
+    cache = TTLCache(ttl=10)
+    for key in "abc":
+        cache.set(key, key)
+
+    cache.invalidate("a")
+    assert [cache.get(key) for key in "abc"] == [None, "b", "c"]
+
+    cache.invalidate()
+    assert [cache.get(key) for key in "abc"] == [None, None, None]
+
+
+def test_ttl_cached_reuses_results_but_not_errors(clock):
+    cache = TTLCache(ttl=10)
+    calls = []
+
+    @ttl_cached(cache, "tools")
+    async def load():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("down")
+        return ["tool"]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(load())
+    assert asyncio.run(load()) == ["tool"]
+    assert asyncio.run(load()) == ["tool"]
+    assert len(calls) == 2
+
+    clock.now += 10
+    asyncio.run(load())
+    assert len(calls) == 3
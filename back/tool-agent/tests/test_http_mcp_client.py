@@ -0,0 +1,44 @@
+"""
+Tests for tool list caching in HTTPMCPClient.
+"""
+
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+orjson = pytest.importorskip("orjson")
+
+from services.http_mcp_client import HTTPMCPClient  # noqa: E402
+
+
+def _handler(request):
+    if request.url.path == "/servers":
+        return httpx.Response(200, content=orjson.dumps([{"name": "calc"}]))
+    if request.headers.get("if-none-match") == '"v1"':
+        return httpx.Response(304)
+    body = orjson.dumps({"tools": [{"name": "add", "description": "Add"}]})
+    return httpx.Response(200, content=body, headers={"etag": '"v1"'})
+
+
+def test_tools_are_tagged_once_and_shared_read_only(monkeypatch):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    monkeypatch.setattr(HTTPMCPClient, "client", property(lambda self: client))
+
+    async def scenario():
+        mcp = HTTPMCPClient("http://mcp")
+        first = await mcp.get_all_tools()
+        mcp.invalidate()
+        # Revalidated with the ETag and served from tools_cache
+        second = await mcp.get_all_tools()
+        await client.aclose()
+        return mcp, first, second
+
+    mcp, first, second = asyncio.run(scenario())
+
+    assert dict(first[0]) == {"name": "add", "description": "Add", "server": "calc"}
+    assert second == first
+    with pytest.raises(TypeError):
+        first[0]["server"] = "other"
+    first.clear()
+    assert len(mcp.tools_cache["calc"]) == 1
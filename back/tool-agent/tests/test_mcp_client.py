@@ -0,0 +1,54 @@
+"""
+Tests for the stdio transport of MCPClient.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+pytest.importorskip("orjson")
+pytest.importorskip("langchain")
+
+from services.mcp_client import MCPClient, MCPServerConfig  # noqa: E402
+
+# Answers every request, logs each method and exits after one tools/call
+FAKE_SERVER = """
+import json, sys
+
+log = open(sys.argv[1], "a")
+for line in sys.stdin:
+    message = json.loads(line)
+    log.write(message["method"] + "\\n")
+    log.flush()
+    if "id" in message:
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {}}))
+        sys.stdout.flush()
+    if message["method"] == "tools/call":
+        break
+"""
+
+
+def test_restarted_process_is_initialized_again(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(FAKE_SERVER)
+    log = tmp_path / "methods.log"
+
+    async def scenario():
+        client = MCPClient(
+            MCPServerConfig(
+                name="fake", command=[sys.executable, str(script)], args=[str(log)]
+            )
+        )
+        assert await client.initialize()
+        await client._send_mcp_request("tools/call", {"name": "add"})
+        await client._process.wait()
+
+        await client._send_mcp_request("tools/call", {"name": "add"})
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+    handshake = ["initialize", "notifications/initialized"]
+    calls = log.read_text().split()
+    assert calls == [*handshake, "tools/call", *handshake, "tools/call"]
@@ -0,0 +1,86 @@
+"""
+Tests for ToolCallBatcher.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("orjson")
+pytest.importorskip("langchain_core")
+
+from services.http_mcp_client import ToolCallBatcher  # noqa: E402
+
+
+class FakeClient:
+    """Records requests and answers them after a short delay."""
+
+    def __init__(self, read_only=()):
+        self.read_only = set(read_only)
+        self.requests = []
+
+    def is_read_only(self, server_name, tool_name):
+        return (server_name, tool_name) in self.read_only
+
+    async def _post_tool_call(self, server_name, tool_name, arguments):
+        self.requests.append([arguments])
+        await asyncio.sleep(0.01)
+        return {"echo": arguments}
+
+    async def _post_tool_batch(self, server_name, tool_name, arguments_list):
+        self.requests.append(list(arguments_list))
+        await asyncio.sleep(0.01)
+        return [{"result": {"echo": arguments}} for arguments in arguments_list]
+
+
+def test_lone_call_is_sent_without_waiting():
+    async def scenario():
+        client = FakeClient()
+        batcher = ToolCallBatcher(client, max_wait_ms=1000)
+        return await asyncio.wait_for(
+            batcher.call("calc", "add", {"a": 1}), timeout=0.5
+        )
+
+    assert asyncio.run(scenario()) == {"echo": {"a": 1}}
+
+
+def test_calls_during_a_request_are_batched():
+    async def scenario():
+        client = FakeClient()
+        batcher = ToolCallBatcher(client, max_wait_ms=5)
+        results = await asyncio.gather(
+            *(batcher.call("calc", "add", {"a": i}) for i in range(3))
+        )
+        return client.requests, results
+
+    requests, results = asyncio.run(scenario())
+
+    assert requests == [[{"a": 0}], [{"a": 1}, {"a": 2}]]
+    assert results == [{"echo": {"a": i}} for i in range(3)]
+
+
+def test_identical_calls_shared_only_for_read_only_tools():
+    async def scenario(read_only):
+        client = FakeClient(read_only)
+        batcher = ToolCallBatcher(client)
+        await asyncio.gather(
+            batcher.call("calc", "add", {"a": 1}),
+            batcher.call("calc", "add", {"a": 1}),
+        )
+        return sum(len(request) for request in client.requests)
+
+    assert asyncio.run(scenario({("calc", "add")})) == 1
+    assert asyncio.run(scenario(())) == 2
+
+
+def test_send_tasks_are_referenced_until_done():
+    async def scenario():
+        batcher = ToolCallBatcher(FakeClient())
+        call = asyncio.ensure_future(batcher.call("calc", "add", {"a": 1}))
+        await asyncio.sleep(0)
+        in_flight = len(batcher._tasks)
+        await call
+        return in_flight, len(batcher._tasks)
+
+    assert asyncio.run(scenario()) == (1, 0)